@@ -0,0 +1,35 @@
+"""employee_import_staging"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_employee_import_staging"
+down_revision = "0002_prd_update"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "employee_import_staging",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("import_id", sa.String(length=36), nullable=False),
+        sa.Column("row_number", sa.Integer(), nullable=False),
+        sa.Column("med_id", sa.BigInteger(), nullable=False),
+        sa.Column("employee_id", sa.String(length=50), nullable=False),
+        sa.Column("name_ar", sa.String(length=150), nullable=False),
+        sa.Column("name_en", sa.String(length=150), nullable=False),
+        sa.Column("job_title", sa.String(length=120), nullable=False),
+        sa.Column("nationality_ar", sa.String(length=120), nullable=False),
+        sa.Column("nationality_en", sa.String(length=120), nullable=False),
+        sa.Column("department_id", sa.Integer(), nullable=False),
+        sa.Column("department_name", sa.String(length=150), nullable=False),
+        sa.Column("account_status", sa.String(length=20), nullable=False),
+    )
+    op.create_index("idx_emp_import_staging_import", "employee_import_staging", ["import_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_emp_import_staging_import", table_name="employee_import_staging")
+    op.drop_table("employee_import_staging")
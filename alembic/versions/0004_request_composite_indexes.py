@@ -0,0 +1,44 @@
+"""request_composite_indexes"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_request_composite_indexes"
+down_revision = "0003_employee_import_staging"
+branch_labels = None
+depends_on = None
+
+REQUEST_TABLES = (("card_requests", "card_req"), ("permit_requests", "permit_req"))
+
+
+def upgrade() -> None:
+    for table, prefix in REQUEST_TABLES:
+        # Status/date filters ordered by request_date, and the manager join
+        # probing by employee; the single-column indexes they extend go away.
+        op.create_index(f"idx_{prefix}_status_date", table, ["status", "request_date", "id"])
+        op.create_index(
+            f"idx_{prefix}_employee_date",
+            table,
+            ["employee_id", "request_date", "id"],
+            mssql_include=["status"],
+        )
+        op.drop_index(f"idx_{prefix}_status", table_name=table)
+        op.drop_index(f"idx_{prefix}_employee", table_name=table)
+
+    op.create_index("idx_employees_department_employee", "employees", ["department_id", "employee_id"])
+    op.drop_index("idx_employees_department", table_name="employees")
+
+    op.create_index("idx_emp_import_staging_employee", "employee_import_staging", ["import_id", "employee_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_emp_import_staging_employee", table_name="employee_import_staging")
+
+    op.create_index("idx_employees_department", "employees", ["department_id"])
+    op.drop_index("idx_employees_department_employee", table_name="employees")
+
+    for table, prefix in REQUEST_TABLES:
+        op.create_index(f"idx_{prefix}_employee", table, ["employee_id"])
+        op.create_index(f"idx_{prefix}_status", table, ["status"])
+        op.drop_index(f"idx_{prefix}_employee_date", table_name=table)
+        op.drop_index(f"idx_{prefix}_status_date", table_name=table)
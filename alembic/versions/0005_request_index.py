@@ -0,0 +1,61 @@
+"""request_index"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005_request_index"
+down_revision = "0004_request_composite_indexes"
+branch_labels = None
+depends_on = None
+
+# (table, kind, card request type column)
+REQUEST_TABLES = (("card_requests", "CARD", "r.request_type"), ("permit_requests", "ACCESS", "NULL"))
+
+
+def upgrade() -> None:
+    op.create_table(
+        "request_index",
+        sa.Column("request_id", sa.BigInteger(), nullable=False, autoincrement=False),
+        sa.Column("request_kind", sa.String(length=10), nullable=False),
+        sa.Column("employee_id", sa.String(length=50), nullable=False),
+        sa.Column("department_id", sa.Integer()),
+        sa.Column("submitted_by_employee_id", sa.String(length=50)),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("card_request_type", sa.String(length=20)),
+        sa.Column("request_date", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.PrimaryKeyConstraint("request_id", "request_kind"),
+    )
+    op.create_index(
+        "idx_request_index_date", "request_index", ["request_date", "request_kind", "request_id"]
+    )
+    op.create_index(
+        "idx_request_index_status_date", "request_index", ["status", "request_date", "request_kind", "request_id"]
+    )
+    op.create_index(
+        "idx_request_index_department_date",
+        "request_index",
+        ["department_id", "request_date", "request_kind", "request_id"],
+        mssql_include=["status"],
+    )
+    op.create_index("idx_request_index_employee", "request_index", ["employee_id"])
+
+    # `python -m app.commands.backfill_request_index` repairs drift later on.
+    for table, kind, card_request_type in REQUEST_TABLES:
+        op.execute(
+            "INSERT INTO request_index (request_id, request_kind, employee_id, department_id,"
+            " submitted_by_employee_id, status, card_request_type, request_date, created_at, updated_at)"
+            f" SELECT r.id, '{kind}', r.employee_id, e.department_id, r.submitted_by_employee_id, r.status,"
+            f" {card_request_type}, r.request_date, r.created_at, r.updated_at"
+            f" FROM {table} r LEFT JOIN employees e ON e.employee_id = r.employee_id"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_request_index_employee", table_name="request_index")
+    op.drop_index("idx_request_index_department_date", table_name="request_index")
+    op.drop_index("idx_request_index_status_date", table_name="request_index")
+    op.drop_index("idx_request_index_date", table_name="request_index")
+    op.drop_table("request_index")
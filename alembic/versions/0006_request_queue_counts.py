@@ -0,0 +1,37 @@
+"""request_queue_counts"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006_request_queue_counts"
+down_revision = "0005_request_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "request_queue_counts",
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("department_id", sa.Integer(), nullable=False, autoincrement=False),
+        sa.Column("request_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("status", "department_id"),
+    )
+    # Requests without an employee row (NULL department) are counted under -1.
+    op.execute(
+        "INSERT INTO request_queue_counts (status, department_id, request_count)"
+        " SELECT status, COALESCE(department_id, -1), COUNT(*) FROM request_index"
+        " GROUP BY status, COALESCE(department_id, -1)"
+    )
+    # Inbox queues: one status, optionally one department, oldest first.
+    op.create_index(
+        "idx_request_index_status_department_date",
+        "request_index",
+        ["status", "department_id", "request_date", "request_kind", "request_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_request_index_status_department_date", table_name="request_index")
+    op.drop_table("request_queue_counts")
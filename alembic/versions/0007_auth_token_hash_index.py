@@ -0,0 +1,18 @@
+"""auth_token_hash_index"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0007_auth_token_hash_index"
+down_revision = "0006_request_queue_counts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # /auth/refresh and /auth/logout find the token row by its hash.
+    op.create_index("idx_auth_tokens_token_hash", "auth_tokens", ["token_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_auth_tokens_token_hash", table_name="auth_tokens")
@@ -0,0 +1,29 @@
+"""audit_outbox"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0008_audit_outbox"
+down_revision = "0007_auth_token_hash_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # AUDIT_ASYNC_ENABLED: entries committed with their change, drained into
+    # audit_logs in the background.
+    op.create_table(
+        "audit_outbox",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("entity_type", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.BigInteger(), nullable=False),
+        sa.Column("action", sa.String(length=100), nullable=False),
+        sa.Column("performed_by_email", sa.String(length=150), nullable=True),
+        sa.Column("metadata", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("audit_outbox")
@@ -1 +1 @@
-__all__ = ["auth", "requests", "approvals", "reports", "lookup"]
+__all__ = ["auth", "requests", "approvals", "reports", "lookup", "inbox", "events"]
@@ -4,12 +4,29 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
+from app.core.instrumentation import TimedRoute
 from app.db.database import get_db
-from app.schemas.approval import CancelRequest, RejectRequest
-from app.services.approval_service import approve_request, cancel_request, complete_request, reject_request
-from app.services.request_service import get_request_by_id
+from app.schemas.approval import BatchActionRequest, BatchActionResponse, CancelRequest, RejectRequest
+from app.services.approval_service import (
+    apply_batch_actions,
+    approve_request,
+    cancel_request,
+    complete_request,
+    reject_request,
+)
+from app.services.request_service import resolve_request_kind
 
-router = APIRouter(prefix="/requests", tags=["approvals"])
+router = APIRouter(prefix="/requests", tags=["approvals"], route_class=TimedRoute)
+
+
+@router.post("/batch", response_model=BatchActionResponse)
+def batch_actions_endpoint(
+    payload: BatchActionRequest,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    items = [item.model_dump() for item in payload.items]
+    return {"results": apply_batch_actions(db, items, user)}
 
 
 @router.post("/{request_id}/approve")
@@ -19,9 +36,8 @@ def approve_request_endpoint(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    request_kind, request_obj = get_request_by_id(db, request_id, request_type)
-    request_obj = approve_request(db, request_kind, request_obj, user)
-    return {"id": request_obj.id, "status": request_obj.status}
+    request_kind = resolve_request_kind(db, request_id, request_type)
+    return approve_request(db, request_kind, request_id, user)
 
 
 @router.post("/{request_id}/reject")
@@ -32,9 +48,8 @@ def reject_request_endpoint(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    request_kind, request_obj = get_request_by_id(db, request_id, request_type)
-    request_obj = reject_request(db, request_kind, request_obj, user, payload.reason)
-    return {"id": request_obj.id, "status": request_obj.status}
+    request_kind = resolve_request_kind(db, request_id, request_type)
+    return reject_request(db, request_kind, request_id, user, payload.reason)
 
 
 @router.post("/{request_id}/complete")
@@ -44,9 +59,8 @@ def complete_request_endpoint(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    request_kind, request_obj = get_request_by_id(db, request_id, request_type)
-    request_obj = complete_request(db, request_kind, request_obj, user)
-    return {"id": request_obj.id, "status": request_obj.status}
+    request_kind = resolve_request_kind(db, request_id, request_type)
+    return complete_request(db, request_kind, request_id, user)
 
 
 @router.post("/{request_id}/cancel")
@@ -57,6 +71,5 @@ def cancel_request_endpoint(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    request_kind, request_obj = get_request_by_id(db, request_id, request_type)
-    request_obj = cancel_request(db, request_kind, request_obj, user, payload.reason)
-    return {"id": request_obj.id, "status": request_obj.status}
+    request_kind = resolve_request_kind(db, request_id, request_type)
+    return cancel_request(db, request_kind, request_id, user, payload.reason)
@@ -0,0 +1,102 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user_async, require_roles
+from app.api.lookup import conditional_response
+from app.api.serialization import REQUEST_DETAIL_ADAPTER, REQUEST_LIST_ADAPTER, json_response
+from app.core.instrumentation import TimedRoute
+from app.db.database import get_async_db
+from app.schemas.area import AreaRead
+from app.schemas.dashboard import DashboardSummaryResponse
+from app.schemas.employee import EmployeeRead, EmployeeSearchResponse
+from app.schemas.request import RequestDetailResponse, RequestListResponse
+from app.services.employee_search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search_employees
+from app.services.lookup_service import get_areas_payload, get_employee_payload
+from app.services.request_service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    STAFF_ROLES,
+    get_dashboard_summary,
+    get_request_detail,
+    list_requests_page,
+)
+
+# Async twins of the read-heavy routes, mounted ahead of the sync routers when
+# ASYNC_DB_ENABLED is set. The service functions run unchanged on the
+# AsyncSession via run_sync, so the event loop is free while the database works.
+# The sync routes stay registered (and documented) behind them.
+router = APIRouter(route_class=TimedRoute, include_in_schema=False)
+
+staff_user = require_roles(STAFF_ROLES, current_user=get_current_user_async)
+
+
+@router.get("/requests/{request_id}", response_model=RequestDetailResponse)
+async def get_request_detail_endpoint_async(
+    request_id: int,
+    request_type: Optional[str] = Query(default=None, alias="type"),
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(staff_user),
+):
+    return json_response(REQUEST_DETAIL_ADAPTER, await db.run_sync(get_request_detail, request_id, request_type, user))
+
+
+@router.get("/requests", response_model=RequestListResponse)
+async def list_requests_endpoint_async(
+    type: Optional[str] = Query(default=None),
+    status: Optional[str] = Query(default=None),
+    from_date: Optional[date] = Query(default=None, alias="from"),
+    to_date: Optional[date] = Query(default=None, alias="to"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    include_total: bool = Query(default=False),
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(staff_user),
+):
+    payload = await db.run_sync(
+        list_requests_page,
+        request_type=type,
+        status_value=status,
+        date_from=from_date,
+        date_to=to_date,
+        user=user,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+    )
+    return json_response(REQUEST_LIST_ADAPTER, payload)
+
+
+@router.get("/reports/dashboard/summary", response_model=DashboardSummaryResponse)
+async def dashboard_summary_async(
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(staff_user),
+):
+    return await db.run_sync(get_dashboard_summary, user)
+
+
+@router.get("/employees/search", response_model=EmployeeSearchResponse)
+async def search_employees_async(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(staff_user),
+):
+    return await db.run_sync(search_employees, q, limit, offset)
+
+
+@router.get("/employees/{employee_id}", response_model=EmployeeRead)
+async def get_employee_async(employee_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    return conditional_response(request, await db.run_sync(get_employee_payload, employee_id))
+
+
+@router.get("/areas", response_model=list[AreaRead])
+async def list_areas_async(
+    request: Request,
+    status: Optional[str] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return conditional_response(request, await db.run_sync(get_areas_payload, status))
@@ -3,21 +3,14 @@ from sqlalchemy.orm import Session
 
 from app.db.database import get_db
 from app.api.deps import get_current_user
-from app.schemas.auth import RequestOTP, TokenResponse, UserInfo, VerifyOTP
-from app.services.auth_service import request_otp, verify_otp
+from app.core.instrumentation import TimedRoute
+from app.schemas.auth import RefreshTokenRequest, RequestOTP, TokenResponse, UserInfo, VerifyOTP
+from app.services.auth_service import AuthUser, refresh_tokens, request_otp, revoke_refresh_token, verify_otp
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=TimedRoute)
 
 
-@router.post("/request-otp")
-def request_otp_endpoint(payload: RequestOTP, db: Session = Depends(get_db)):
-    request_otp(db, payload.email)
-    return {"message": "OTP sent"}
-
-
-@router.post("/verify-otp", response_model=TokenResponse)
-def verify_otp_endpoint(payload: VerifyOTP, db: Session = Depends(get_db)):
-    access_token, refresh_token, user = verify_otp(db, payload.email, payload.otp)
+def _token_response(access_token: str, refresh_token: str, user: AuthUser) -> dict:
     user_info = UserInfo(role=user.role_code, employee_id=user.employee_id, email=user.internal_email)
     return {
         "access_token": access_token,
@@ -30,6 +23,28 @@ def verify_otp_endpoint(payload: VerifyOTP, db: Session = Depends(get_db)):
     }
 
 
+@router.post("/request-otp")
+def request_otp_endpoint(payload: RequestOTP, db: Session = Depends(get_db)):
+    request_otp(db, payload.email)
+    return {"message": "OTP sent"}
+
+
+@router.post("/verify-otp", response_model=TokenResponse)
+def verify_otp_endpoint(payload: VerifyOTP, db: Session = Depends(get_db)):
+    return _token_response(*verify_otp(db, payload.email, payload.otp))
+
+
+@router.post("/refresh", response_model=TokenResponse)
+def refresh_endpoint(payload: RefreshTokenRequest, db: Session = Depends(get_db)):
+    return _token_response(*refresh_tokens(db, payload.refresh_token))
+
+
+@router.post("/logout")
+def logout_endpoint(payload: RefreshTokenRequest, db: Session = Depends(get_db)):
+    revoke_refresh_token(db, payload.refresh_token)
+    return {"message": "Logged out"}
+
+
 @router.get("/me", response_model=UserInfo)
 def get_me(user=Depends(get_current_user)):
     return UserInfo(role=user.role_code, employee_id=user.employee_id, email=user.internal_email)
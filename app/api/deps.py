@@ -1,9 +1,10 @@
 from typing import Callable, Iterable
 
 from fastapi import Depends, Header, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 from app.services.auth_service import get_user_from_token
 
 
@@ -38,8 +39,18 @@ def get_optional_user(
     return get_user_from_token(db, token)
 
 
-def require_roles(roles: Iterable[str]) -> Callable:
-    def _role_guard(user=Depends(get_current_user)):
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    authorization: str | None = Header(default=None),
+):
+    token = _extract_token(authorization)
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
+    return await db.run_sync(get_user_from_token, token)
+
+
+def require_roles(roles: Iterable[str], current_user: Callable = get_current_user) -> Callable:
+    async def _role_guard(user=Depends(current_user)):
         if user.role_code not in roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         return user
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import require_roles
+from app.core.instrumentation import TimedRoute
+from app.db.database import get_db
+from app.services.request_events import request_events
+from app.services.request_service import STAFF_ROLES, request_event_filter
+
+router = APIRouter(prefix="/events", tags=["events"], route_class=TimedRoute)
+
+
+@router.get("/requests")
+async def stream_request_events(
+    type: Optional[str] = Query(default=None),
+    last_event_id: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+    user=Depends(require_roles(STAFF_ROLES)),
+):
+    # The scope is resolved up front; the stream itself never touches the database.
+    visible = await run_in_threadpool(request_event_filter, db, user, type)
+    return StreamingResponse(
+        request_events.stream(visible, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import require_roles
+from app.api.serialization import INBOX_ADAPTER, json_response
+from app.core.instrumentation import TimedRoute
+from app.db.database import get_db
+from app.schemas.request import InboxCountsResponse, InboxResponse
+from app.services.request_service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    STAFF_ROLES,
+    get_inbox_counts,
+    get_inbox_page,
+)
+
+router = APIRouter(prefix="/inbox", tags=["inbox"], route_class=TimedRoute)
+
+
+@router.get("", response_model=InboxResponse)
+def get_inbox_endpoint(
+    queue: Optional[str] = Query(default=None),
+    type: Optional[str] = Query(default=None),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    db: Session = Depends(get_db),
+    user=Depends(require_roles(STAFF_ROLES)),
+):
+    payload = get_inbox_page(db, user, queue=queue, request_type=type, limit=limit, cursor=cursor)
+    return json_response(INBOX_ADAPTER, payload)
+
+
+@router.get("/counts", response_model=InboxCountsResponse)
+def get_inbox_counts_endpoint(
+    db: Session = Depends(get_db),
+    user=Depends(require_roles(STAFF_ROLES)),
+):
+    return {"counts": get_inbox_counts(db, user)}
@@ -1,21 +1,41 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_roles
+from app.core.config import settings
+from app.core.instrumentation import TimedRoute
 from app.db.database import get_db
-from app.models.area import Area
-from app.models.employee import Employee
 from app.schemas.area import AreaRead
-from app.schemas.employee import EmployeeRead
+from app.schemas.employee import EmployeeRead, EmployeeSearchResponse
 from app.services.employee_import_service import import_employees_from_csv
+from app.services.employee_search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search_employees
+from app.services.lookup_service import CachedPayload, get_areas_payload, get_employee_payload
+from app.services.request_service import STAFF_ROLES
 
-router = APIRouter(tags=["lookup"])
+router = APIRouter(tags=["lookup"], route_class=TimedRoute)
 
 ADMIN_ROLES = {"ADMIN", "SYSTEM_ADMIN"}
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def conditional_response(request: Request, payload: CachedPayload) -> Response:
+    headers = {"ETag": payload.etag, "Cache-Control": settings.lookup_cache_control}
+    if _etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
 @router.post("/employees/import")
 def import_employees_endpoint(
     file: UploadFile = File(...),
@@ -25,22 +45,27 @@ def import_employees_endpoint(
     return import_employees_from_csv(db, file)
 
 
+# Declared before /employees/{employee_id} so "search" is not taken as an id.
+@router.get("/employees/search", response_model=EmployeeSearchResponse)
+def search_employees_endpoint(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+    user=Depends(require_roles(STAFF_ROLES)),
+):
+    return search_employees(db, q, limit, offset)
+
+
 @router.get("/employees/{employee_id}", response_model=EmployeeRead)
-def get_employee(employee_id: str, db: Session = Depends(get_db)):
-    employee = db.query(Employee).filter(Employee.employee_id == employee_id).first()
-    if not employee or employee.account_status != "ACTIVE":
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
-    return employee
+def get_employee(employee_id: str, request: Request, db: Session = Depends(get_db)):
+    return conditional_response(request, get_employee_payload(db, employee_id))
 
 
 @router.get("/areas", response_model=list[AreaRead])
 def list_areas(
+    request: Request,
     status: Optional[str] = Query(default=None),
     db: Session = Depends(get_db),
 ):
-    query = db.query(Area)
-    if status:
-        query = query.filter(Area.status == status.upper())
-    else:
-        query = query.filter(Area.status == "ACTIVE")
-    return query.order_by(Area.area_name).all()
+    return conditional_response(request, get_areas_payload(db, status))
@@ -0,0 +1,71 @@
+import time
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.api.deps import require_roles
+from app.core.config import settings
+from app.core.instrumentation import TimedRoute
+from app.db.database import async_engine, engine
+from app.services.auth_purge import auth_purge
+from app.services.auth_service import principal_cache
+from app.services.employee_directory import employee_directory
+from app.services.employee_search import employee_search_index
+from app.services.request_events import request_events
+from app.services.request_service import ROLE_ADMIN
+from app.utils.audit import audit_writer
+from app.utils.email import outbox
+
+router = APIRouter(tags=["monitoring"], route_class=TimedRoute)
+
+
+@router.get("/health/ready")
+def readiness():
+    started = time.perf_counter()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "database": "error"},
+        )
+    latency_ms = round((time.perf_counter() - started) * 1000, 3)
+    if latency_ms > settings.db_ready_max_latency_ms:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "database": "slow", "db_latency_ms": latency_ms},
+        )
+    return {"status": "ok", "database": "ok", "db_latency_ms": latency_ms}
+
+
+@router.get("/admin/db/pool")
+def pool_telemetry(user=Depends(require_roles(ROLE_ADMIN))):
+    telemetry = {
+        **engine.pool.telemetry(),
+        "recycle_seconds": settings.db_pool_recycle_seconds,
+        "pre_ping": settings.db_pool_pre_ping,
+        "use_lifo": settings.db_pool_use_lifo,
+    }
+    if async_engine is not None:
+        telemetry["async_pool"] = async_engine.pool.telemetry()
+    return telemetry
+
+
+@router.get("/admin/audit/queue")
+def audit_queue_telemetry(user=Depends(require_roles(ROLE_ADMIN))):
+    return {"async_enabled": settings.audit_async_enabled, **audit_writer.stats()}
+
+
+@router.get("/admin/stats")
+def runtime_stats(user=Depends(require_roles(ROLE_ADMIN))):
+    return {
+        "principal_cache": principal_cache.stats(),
+        "employee_directory": employee_directory.stats(),
+        "smtp_outbox": outbox.stats(),
+        "employee_search": employee_search_index.stats(),
+        "request_events": request_events.stats(),
+        "auth_purge": auth_purge.stats(),
+    }
@@ -5,6 +5,8 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_optional_user, require_roles
+from app.api.serialization import REQUEST_DETAIL_ADAPTER, REQUEST_LIST_ADAPTER, json_response
+from app.core.instrumentation import TimedRoute
 from app.db.database import get_db
 from app.schemas.request import (
     CardRequestCreate,
@@ -13,14 +15,16 @@ from app.schemas.request import (
     RequestListResponse,
 )
 from app.services.request_service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
     STAFF_ROLES,
     create_card_request,
     create_permit_request,
     get_request_detail,
-    list_requests,
+    list_requests_page,
 )
 
-router = APIRouter(prefix="/requests", tags=["requests"])
+router = APIRouter(prefix="/requests", tags=["requests"], route_class=TimedRoute)
 
 
 @router.post("/card")
@@ -50,7 +54,7 @@ def get_request_detail_endpoint(
     db: Session = Depends(get_db),
     user=Depends(require_roles(STAFF_ROLES)),
 ):
-    return get_request_detail(db, request_id, request_type, user)
+    return json_response(REQUEST_DETAIL_ADAPTER, get_request_detail(db, request_id, request_type, user))
 
 
 @router.get("", response_model=RequestListResponse)
@@ -59,10 +63,21 @@ def list_requests_endpoint(
     status: Optional[str] = Query(default=None),
     from_date: Optional[date] = Query(default=None, alias="from"),
     to_date: Optional[date] = Query(default=None, alias="to"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    include_total: bool = Query(default=False),
     db: Session = Depends(get_db),
     user=Depends(require_roles(STAFF_ROLES)),
 ):
-    items = list_requests(
-        db, request_type=type, status_value=status, date_from=from_date, date_to=to_date, user=user
+    payload = list_requests_page(
+        db,
+        request_type=type,
+        status_value=status,
+        date_from=from_date,
+        date_to=to_date,
+        user=user,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return {"items": items, "total": len(items)}
+    return json_response(REQUEST_LIST_ADAPTER, payload)
@@ -0,0 +1,17 @@
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.schemas.request import InboxResponse, RequestDetailResponse, RequestListResponse
+
+# Endpoints that return a Response skip FastAPI's response_model pass
+# (validation, jsonable conversion, then json.dumps). The routes keep their
+# response_model for the OpenAPI schema; the payload is validated against the
+# same model here and encoded by pydantic-core in one step.
+REQUEST_LIST_ADAPTER = TypeAdapter(RequestListResponse)
+REQUEST_DETAIL_ADAPTER = TypeAdapter(RequestDetailResponse)
+INBOX_ADAPTER = TypeAdapter(InboxResponse)
+
+
+def json_response(adapter: TypeAdapter, payload) -> Response:
+    body = adapter.dump_json(adapter.validate_python(payload, from_attributes=True))
+    return Response(content=body, media_type="application/json")
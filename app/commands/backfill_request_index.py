@@ -0,0 +1,26 @@
+import argparse
+import json
+import sys
+
+from app.db.database import engine
+from app.services.request_index import BACKFILL_BATCH_SIZE, backfill_request_index, request_index_drift
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild missing or stale request_index rows.")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="request ids per transaction")
+    parser.add_argument("--check", action="store_true", help="only report drift; exit 1 if there is any")
+    args = parser.parse_args()
+
+    if args.check:
+        drift = request_index_drift(engine)
+        print(json.dumps(drift, indent=2))
+        if any(count for counts in drift.values() for count in counts.values()):
+            sys.exit(1)
+        return
+
+    print(json.dumps(backfill_request_index(engine, args.batch_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
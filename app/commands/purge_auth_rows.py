@@ -0,0 +1,22 @@
+import argparse
+import json
+
+from app.db.database import engine
+from app.services.auth_purge import PURGE_BATCH_SIZE, auth_row_counts, purge_auth_rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete expired OTPs and expired or revoked refresh tokens.")
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE, help="rows deleted per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="only report how many rows would be deleted")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        print(json.dumps(auth_row_counts(engine), indent=2))
+        return
+
+    print(json.dumps(purge_auth_rows(engine, args.batch_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
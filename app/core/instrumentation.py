@@ -0,0 +1,165 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+import traceback
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.timing")
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_QUERY_STARTS_KEY = "timing_query_starts"
+
+
+@dataclass
+class RequestTimings:
+    started: float
+    queries: int = 0
+    db_seconds: float = 0.0
+    handler_done: Optional[float] = None
+    response_started: Optional[float] = None
+
+    def server_timing(self) -> str:
+        now = self.response_started or time.perf_counter()
+        parts = [
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries"',
+            f"app;dur={(now - self.started) * 1000:.1f}",
+        ]
+        if self.handler_done is not None:
+            parts.append(f"serialize;dur={(now - self.handler_done) * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def _call_site() -> str:
+    # Innermost frame in our own code outside this module.
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(_APP_ROOT) and frame.filename != __file__:
+            return f"{os.path.relpath(frame.filename, os.path.dirname(_APP_ROOT))}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+def instrument_engine(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault(_QUERY_STARTS_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info[_QUERY_STARTS_KEY].pop()
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.queries += 1
+            timings.db_seconds += elapsed
+        if settings.slow_query_ms and elapsed * 1000 >= settings.slow_query_ms:
+            logger.warning(
+                "Slow query (%.1f ms) at %s: %s",
+                elapsed * 1000,
+                _call_site(),
+                " ".join(statement.split())[:2000],
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_failed_query(exception_context) -> None:
+        connection = exception_context.connection
+        if connection is not None and connection.info.get(_QUERY_STARTS_KEY):
+            connection.info[_QUERY_STARTS_KEY].pop()
+
+
+def _mark_handler_done(endpoint):
+    if getattr(endpoint, "__timed__", False):
+        return endpoint
+
+    def _done() -> None:
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.handler_done = time.perf_counter()
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _done()
+
+    else:
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                _done()
+
+    wrapper.__timed__ = True
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    # Marks when the endpoint returns, so response validation and JSON
+    # encoding can be reported separately from the handler itself.
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _mark_handler_done(endpoint), **kwargs)
+
+
+class RequestTimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(started=time.perf_counter())
+        token = _current_timings.set(timings)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timings.response_started = time.perf_counter()
+                if settings.server_timing_header_enabled:
+                    MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timings.reset(token)
+            finished = time.perf_counter()
+            route = scope.get("route")
+            logger.info(
+                json.dumps(
+                    {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": getattr(route, "path", None),
+                        "status": status_code,
+                        "duration_ms": round((finished - timings.started) * 1000, 2),
+                        "db_queries": timings.queries,
+                        "db_ms": round(timings.db_seconds * 1000, 2),
+                        "serialize_ms": (
+                            round((timings.response_started - timings.handler_done) * 1000, 2)
+                            if timings.handler_done and timings.response_started
+                            else None
+                        ),
+                    }
+                )
+            )
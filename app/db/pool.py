@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import deque
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+LATENCY_SAMPLES = 2048
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class InstrumentedQueuePool(QueuePool):
+    # QueuePool that records how long callers wait for a connection, including
+    # pre-ping and connect time, and how often the pool was exhausted.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self._latencies_ms: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+
+    def connect(self):
+        exhausted = self.checkedin() == 0 and self._max_overflow >= 0 and self.overflow() >= self._max_overflow
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            with self._metrics_lock:
+                self.timeouts += 1
+                self.waits += 1
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._metrics_lock:
+            self.checkouts += 1
+            if exhausted:
+                self.waits += 1
+            self._latencies_ms.append(elapsed_ms)
+        return connection
+
+    def telemetry(self) -> dict:
+        with self._metrics_lock:
+            latencies = sorted(self._latencies_ms)
+            checkouts, waits, timeouts = self.checkouts, self.waits, self.timeouts
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+            "max_overflow": self._max_overflow,
+            "timeout_seconds": self.timeout(),
+            "checkouts": checkouts,
+            "waits": waits,
+            "timeouts": timeouts,
+            "checkout_latency_ms": {
+                "samples": len(latencies),
+                "p50": round(_percentile(latencies, 0.50), 3),
+                "p95": round(_percentile(latencies, 0.95), 3),
+                "p99": round(_percentile(latencies, 0.99), 3),
+                "max": round(latencies[-1], 3) if latencies else 0.0,
+            },
+        }
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    pass
@@ -1,10 +1,35 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
-from app.api import auth, requests, approvals, reports, lookup
+from app.api import async_reads, auth, requests, approvals, reports, lookup, monitoring, inbox, events
 from app.core.config import settings
+from app.core.instrumentation import RequestTimingMiddleware, instrument_engine
+from app.db.database import async_engine, engine
+from app.services.auth_purge import auth_purge
+from app.services.employee_search import employee_search_index
+from app.utils.audit import audit_writer
+from app.utils.email import outbox
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    auth_purge.start()
+    employee_search_index.start()
+    if settings.audit_async_enabled:
+        audit_writer.start()
+    yield
+    await run_in_threadpool(auth_purge.stop)
+    await run_in_threadpool(employee_search_index.stop)
+    await run_in_threadpool(outbox.stop)
+    await run_in_threadpool(audit_writer.stop)
+    if async_engine is not None:
+        await async_engine.dispose()
 
-app = FastAPI(title=settings.app_name)
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,13 +37,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+if settings.request_timing_enabled:
+    instrument_engine(engine)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+    app.add_middleware(RequestTimingMiddleware)
+
+if settings.async_db_enabled:
+    # Registered first so these routes win over their sync counterparts.
+    app.include_router(async_reads.router)
+
 app.include_router(auth.router)
 app.include_router(requests.router)
+app.include_router(inbox.router)
+app.include_router(events.router)
 app.include_router(approvals.router)
 app.include_router(reports.router)
 app.include_router(lookup.router)
+app.include_router(monitoring.router)
 
 
 @app.get("/")
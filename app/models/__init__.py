@@ -8,6 +8,10 @@ from app.models.permit_request_area import PermitRequestArea
 from app.models.user_otp import UserOTP
 from app.models.auth_token import AuthToken
 from app.models.audit_log import AuditLog
+from app.models.audit_outbox import AuditOutbox
+from app.models.employee_import_staging import EmployeeImportStaging
+from app.models.request_index import RequestIndex
+from app.models.request_queue_count import RequestQueueCount
 
 __all__ = [
     "Employee",
@@ -20,4 +24,8 @@ __all__ = [
     "UserOTP",
     "AuthToken",
     "AuditLog",
+    "AuditOutbox",
+    "EmployeeImportStaging",
+    "RequestIndex",
+    "RequestQueueCount",
 ]
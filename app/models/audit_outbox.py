@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, BigInteger, String, JSON
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class AuditOutbox(Base):
+    # Audit entries committed with their change in async mode, moved into
+    # audit_logs by utils.audit.AuditWriter and then deleted.
+    __tablename__ = "audit_outbox"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(BigInteger, nullable=False)
+    action = Column(String(100), nullable=False)
+    performed_by_email = Column(String(150))
+    metadata_json = Column("metadata", JSON)
+    created_at = Column(DateTime, server_default=func.now())
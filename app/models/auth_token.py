@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, BigInteger, String
+from sqlalchemy import Boolean, Column, DateTime, BigInteger, Index, String
 from sqlalchemy.sql import func
 
 from app.db.database import Base
@@ -6,6 +6,12 @@ from app.db.database import Base
 
 class AuthToken(Base):
     __tablename__ = "auth_tokens"
+    __table_args__ = (
+        Index("idx_auth_tokens_email", "internal_email"),
+        Index("idx_auth_tokens_expires", "expires_at"),
+        Index("idx_auth_tokens_revoked", "revoked"),
+        Index("idx_auth_tokens_token_hash", "token_hash"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     internal_email = Column(String(150), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import Column, BigInteger, DateTime, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.sql import func
 
 from app.db.database import Base
@@ -6,6 +6,12 @@ from app.db.database import Base
 
 class CardRequest(Base):
     __tablename__ = "card_requests"
+    __table_args__ = (
+        Index("idx_card_req_status_date", "status", "request_date", "id"),
+        Index("idx_card_req_employee_date", "employee_id", "request_date", "id", mssql_include=["status"]),
+        Index("idx_card_req_submitted_by", "submitted_by_employee_id"),
+        Index("idx_card_req_dates", "request_date"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     employee_id = Column(String(50), ForeignKey("employees.employee_id"), nullable=False)
@@ -8,7 +8,7 @@ from app.db.database import Base
 class Employee(Base):
     __tablename__ = "employees"
     __table_args__ = (
-        Index("idx_employees_department", "department_id"),
+        Index("idx_employees_department_employee", "department_id", "employee_id"),
         Index("idx_employees_status", "account_status"),
     )
 
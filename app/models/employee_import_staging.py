@@ -0,0 +1,25 @@
+from sqlalchemy import Column, BigInteger, Index, Integer, String
+
+from app.db.database import Base
+
+
+class EmployeeImportStaging(Base):
+    __tablename__ = "employee_import_staging"
+    __table_args__ = (
+        Index("idx_emp_import_staging_import", "import_id", "id"),
+        Index("idx_emp_import_staging_employee", "import_id", "employee_id"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    import_id = Column(String(36), nullable=False)
+    row_number = Column(Integer, nullable=False)
+    med_id = Column(BigInteger, nullable=False)
+    employee_id = Column(String(50), nullable=False)
+    name_ar = Column(String(150), nullable=False)
+    name_en = Column(String(150), nullable=False)
+    job_title = Column(String(120), nullable=False)
+    nationality_ar = Column(String(120), nullable=False)
+    nationality_en = Column(String(120), nullable=False)
+    department_id = Column(Integer, nullable=False)
+    department_name = Column(String(150), nullable=False)
+    account_status = Column(String(20), nullable=False)
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, BigInteger, DateTime, Index, Integer, String
+
+from app.db.database import Base
+
+
+class RequestIndex(Base):
+    # One row per card or permit request, kept in step with the request tables
+    # by request_service/approval_service so list, count and id lookups read a
+    # single table. Rebuild with `python -m app.commands.backfill_request_index`.
+    __tablename__ = "request_index"
+    __table_args__ = (
+        Index("idx_request_index_date", "request_date", "request_kind", "request_id"),
+        Index("idx_request_index_status_date", "status", "request_date", "request_kind", "request_id"),
+        Index(
+            "idx_request_index_department_date",
+            "department_id",
+            "request_date",
+            "request_kind",
+            "request_id",
+            mssql_include=["status"],
+        ),
+        Index(
+            "idx_request_index_status_department_date",
+            "status",
+            "department_id",
+            "request_date",
+            "request_kind",
+            "request_id",
+        ),
+        Index("idx_request_index_employee", "employee_id"),
+    )
+
+    request_id = Column(BigInteger, primary_key=True, autoincrement=False)
+    request_kind = Column(String(10), primary_key=True)
+    employee_id = Column(String(50), nullable=False)
+    # NULL when the request's employee row is missing.
+    department_id = Column(Integer)
+    submitted_by_employee_id = Column(String(50))
+    status = Column(String(32), nullable=False)
+    card_request_type = Column(String(20))
+    request_date = Column(DateTime, nullable=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+
+from app.db.database import Base
+
+
+class RequestQueueCount(Base):
+    # Number of requests per (status, department), adjusted in the same
+    # transaction as request_index so inbox badges are a key lookup.
+    __tablename__ = "request_queue_counts"
+
+    status = Column(String(32), primary_key=True)
+    department_id = Column(Integer, primary_key=True, autoincrement=False)
+    request_count = Column(Integer, nullable=False, default=0)
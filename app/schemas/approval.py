@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, conlist
 
 
 class RejectRequest(BaseModel):
@@ -9,3 +9,28 @@ class RejectRequest(BaseModel):
 
 class CancelRequest(BaseModel):
     reason: Optional[str] = None
+
+
+class BatchActionItem(BaseModel):
+    id: int
+    type: Optional[str] = None
+    action: Literal["approve", "reject", "complete"]
+    reason: Optional[str] = None
+
+
+class BatchActionRequest(BaseModel):
+    items: conlist(BatchActionItem, min_length=1, max_length=500)
+
+
+class BatchActionResult(BaseModel):
+    id: int
+    type: Optional[Literal["CARD", "ACCESS"]] = None
+    action: str
+    ok: bool
+    status: Optional[str] = None
+    status_code: int
+    detail: Optional[str] = None
+
+
+class BatchActionResponse(BaseModel):
+    results: List[BatchActionResult]
@@ -16,6 +16,10 @@ class VerifyOTP(BaseModel):
     otp: str
 
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
 class TokenResponse(BaseModel):
     access_token: str
     refresh_token: str
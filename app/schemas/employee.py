@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
@@ -20,3 +22,9 @@ class EmployeeSnapshot(EmployeeRead):
 
     class Config:
         from_attributes = True
+
+
+class EmployeeSearchResponse(BaseModel):
+    items: List[EmployeeRead]
+    total: int
+    next_offset: Optional[int] = None
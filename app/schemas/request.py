@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, conlist
 
@@ -96,4 +96,16 @@ class RequestListItem(BaseModel):
 
 class RequestListResponse(BaseModel):
     items: List[RequestListItem]
-    total: int
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+class InboxResponse(BaseModel):
+    queue: str
+    items: List[RequestListItem]
+    next_cursor: Optional[str] = None
+    counts: Dict[str, int]
+
+
+class InboxCountsResponse(BaseModel):
+    counts: Dict[str, int]
@@ -1,12 +1,17 @@
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Any, Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session, aliased
 
 from app.models.employee import Employee
 from app.models.card_request import CardRequest
 from app.models.permit_request import PermitRequest
+from app.models.request_index import RequestIndex
 from app.services.auth_service import AuthUser
+from app.services.employee_directory import employee_directory, ensure_manager_scope
 from app.services.request_service import (
     ROLE_CARD_PRINTING,
     ROLE_ADMIN,
@@ -14,155 +19,377 @@ from app.services.request_service import (
     ROLE_SECURITY,
     STATUS_CANCELLED,
     STATUS_COMPLETED,
+    STATUS_DRAFT,
     STATUS_IN_PROCESS,
     STATUS_PENDING_MANAGER,
     STATUS_PENDING_SECURITY,
     STATUS_REJECTED_MANAGER,
     STATUS_REJECTED_SECURITY,
     TERMINAL_STATUSES,
+    normalize_request_type,
 )
+from app.services.request_index import sync_request_index
 from app.utils.audit import log_audit
 
+REQUEST_MODELS = {"CARD": CardRequest, "ACCESS": PermitRequest}
+ENTITY_TYPES = {"CARD": "card_request", "ACCESS": "permit_request"}
+
+# Position of each status in the workflow; a request only ever moves forward.
+WORKFLOW_STAGE = {
+    STATUS_DRAFT: 0,
+    STATUS_PENDING_MANAGER: 1,
+    STATUS_PENDING_SECURITY: 2,
+    STATUS_REJECTED_MANAGER: 2,
+    STATUS_IN_PROCESS: 3,
+    STATUS_REJECTED_SECURITY: 3,
+    STATUS_COMPLETED: 4,
+    STATUS_CANCELLED: 4,
+}
+CANCELLABLE_STATUSES = set(WORKFLOW_STAGE) - TERMINAL_STATUSES
+
 
 def _now() -> datetime:
     return datetime.utcnow()
 
 
-def _ensure_manager_scope(db: Session, user: AuthUser, employee_id: str) -> None:
-    manager = db.query(Employee).filter(Employee.employee_id == user.employee_id).first()
-    target = db.query(Employee).filter(Employee.employee_id == employee_id).first()
-    if not manager or not target or manager.department_id != target.department_id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+def _manager_scope_clause(model, user: AuthUser):
+    manager = aliased(Employee)
+    target = aliased(Employee)
+    manager_department = select(manager.department_id).where(manager.employee_id == user.employee_id)
+    return model.employee_id.in_(
+        select(target.employee_id).where(target.department_id == manager_department.scalar_subquery())
+    )
+
+
+@dataclass(frozen=True)
+class _TransitionPlan:
+    expected_statuses: frozenset[str]
+    values: dict[str, Any]
+    action: str
+    metadata: Optional[dict[str, Any]]
+    manager_scoped: bool
+
+    @property
+    def from_status(self) -> Optional[str]:
+        # The status every matched request had, when the plan allows only one.
+        if len(self.expected_statuses) == 1:
+            return next(iter(self.expected_statuses))
+        return None
+
+
+def _transition_conflict(current_status: str, plan: _TransitionPlan) -> HTTPException:
+    current_stage = WORKFLOW_STAGE.get(current_status, 0)
+    expected_stage = max(WORKFLOW_STAGE[value] for value in plan.expected_statuses)
+    if current_status == plan.values["status"] or (
+        current_status not in TERMINAL_STATUSES and current_stage > expected_stage
+    ):
+        return HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Request was updated by another user")
+    if current_status in TERMINAL_STATUSES:
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request completed")
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
 
 
-def approve_request(
-    db: Session, request_type: str, request_obj: CardRequest | PermitRequest, user: AuthUser
-):
-    if request_obj.status in TERMINAL_STATUSES:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request completed")
+def _raise_transition_error(db: Session, model, request_id: int, user: AuthUser, plan: _TransitionPlan) -> None:
+    row = db.execute(select(model.status, model.employee_id).where(model.id == request_id)).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
+    if plan.manager_scoped:
+        ensure_manager_scope(db, user, row.employee_id)
+    raise _transition_conflict(row.status, plan)
 
+
+def _transition(db: Session, request_type: str, request_id: int, user: AuthUser, plan: _TransitionPlan) -> dict:
+    # The status check and the write happen in one conditional UPDATE, so of
+    # several concurrent transitions on the same request exactly one matches.
+    model = REQUEST_MODELS[request_type]
+    conditions = [model.id == request_id, model.status.in_(plan.expected_statuses)]
+    if plan.manager_scoped:
+        conditions.append(_manager_scope_clause(model, user))
+
+    result = db.execute(
+        update(model).where(*conditions).values(**plan.values).execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        _raise_transition_error(db, model, request_id, user, plan)
+    sync_request_index(db, request_type, [request_id], plan.values["status"], plan.from_status)
+
+    log_audit(
+        db,
+        entity_type=ENTITY_TYPES[request_type],
+        entity_id=request_id,
+        action=plan.action,
+        performed_by_email=user.internal_email,
+        metadata=plan.metadata,
+    )
+
+    db.commit()
+    return {"id": request_id, "status": plan.values["status"]}
+
+
+def _plan_approve(user: AuthUser) -> _TransitionPlan:
     if user.role_code in ROLE_MANAGER:
-        if request_obj.status != STATUS_PENDING_MANAGER:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
-        _ensure_manager_scope(db, user, request_obj.employee_id)
-        request_obj.status = STATUS_PENDING_SECURITY
-        request_obj.manager_employee_id = user.employee_id
-        request_obj.manager_updated_at = _now()
-        request_obj.rejection_reason = None
+        expected_status = STATUS_PENDING_MANAGER
+        values = {
+            "status": STATUS_PENDING_SECURITY,
+            "manager_employee_id": user.employee_id,
+            "manager_updated_at": _now(),
+            "rejection_reason": None,
+        }
     elif user.role_code in ROLE_SECURITY:
-        if request_obj.status != STATUS_PENDING_SECURITY:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
-        request_obj.status = STATUS_IN_PROCESS
-        request_obj.security_employee_id = user.employee_id
-        request_obj.security_updated_at = _now()
-        request_obj.rejection_reason = None
+        expected_status = STATUS_PENDING_SECURITY
+        values = {
+            "status": STATUS_IN_PROCESS,
+            "security_employee_id": user.employee_id,
+            "security_updated_at": _now(),
+            "rejection_reason": None,
+        }
     else:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    entity_type = "card_request" if request_type == "CARD" else "permit_request"
-    log_audit(
-        db,
-        entity_type=entity_type,
-        entity_id=request_obj.id,
+    return _TransitionPlan(
+        expected_statuses=frozenset({expected_status}),
+        values=values,
         action="APPROVED",
-        performed_by_email=user.internal_email,
         metadata={"role": user.role_code},
+        manager_scoped=user.role_code in ROLE_MANAGER,
     )
 
-    db.commit()
-    db.refresh(request_obj)
-    return request_obj
-
 
-def reject_request(
-    db: Session, request_type: str, request_obj: CardRequest | PermitRequest, user: AuthUser, reason: str
-):
+def _plan_reject(user: AuthUser, reason: Optional[str]) -> _TransitionPlan:
     if not reason:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Rejection reason required")
-    if request_obj.status in TERMINAL_STATUSES:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request completed")
 
     if user.role_code in ROLE_MANAGER:
-        if request_obj.status != STATUS_PENDING_MANAGER:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
-        _ensure_manager_scope(db, user, request_obj.employee_id)
-        request_obj.status = STATUS_REJECTED_MANAGER
-        request_obj.manager_employee_id = user.employee_id
-        request_obj.manager_updated_at = _now()
+        expected_status = STATUS_PENDING_MANAGER
+        values = {
+            "status": STATUS_REJECTED_MANAGER,
+            "manager_employee_id": user.employee_id,
+            "manager_updated_at": _now(),
+        }
     elif user.role_code in ROLE_SECURITY:
-        if request_obj.status != STATUS_PENDING_SECURITY:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
-        request_obj.status = STATUS_REJECTED_SECURITY
-        request_obj.security_employee_id = user.employee_id
-        request_obj.security_updated_at = _now()
+        expected_status = STATUS_PENDING_SECURITY
+        values = {
+            "status": STATUS_REJECTED_SECURITY,
+            "security_employee_id": user.employee_id,
+            "security_updated_at": _now(),
+        }
     else:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    request_obj.rejection_reason = reason
-
-    entity_type = "card_request" if request_type == "CARD" else "permit_request"
-    log_audit(
-        db,
-        entity_type=entity_type,
-        entity_id=request_obj.id,
+    values["rejection_reason"] = reason
+    return _TransitionPlan(
+        expected_statuses=frozenset({expected_status}),
+        values=values,
         action="REJECTED",
-        performed_by_email=user.internal_email,
         metadata={"role": user.role_code, "reason": reason},
+        manager_scoped=user.role_code in ROLE_MANAGER,
     )
 
-    db.commit()
-    db.refresh(request_obj)
-    return request_obj
-
 
-def complete_request(
-    db: Session, request_type: str, request_obj: CardRequest | PermitRequest, user: AuthUser
-):
+def _plan_complete(user: AuthUser) -> _TransitionPlan:
     if user.role_code not in ROLE_CARD_PRINTING:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    if request_obj.status != STATUS_IN_PROCESS:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
-
-    request_obj.status = STATUS_COMPLETED
-    request_obj.printing_employee_id = user.employee_id
-    request_obj.printing_updated_at = _now()
 
-    entity_type = "card_request" if request_type == "CARD" else "permit_request"
-    log_audit(
-        db,
-        entity_type=entity_type,
-        entity_id=request_obj.id,
+    return _TransitionPlan(
+        expected_statuses=frozenset({STATUS_IN_PROCESS}),
+        values={
+            "status": STATUS_COMPLETED,
+            "printing_employee_id": user.employee_id,
+            "printing_updated_at": _now(),
+        },
         action="COMPLETED",
-        performed_by_email=user.internal_email,
+        metadata=None,
+        manager_scoped=False,
     )
 
-    db.commit()
-    db.refresh(request_obj)
-    return request_obj
-
 
-def cancel_request(
-    db: Session, request_type: str, request_obj: CardRequest | PermitRequest, user: AuthUser, reason: str | None
-):
+def _plan_cancel(user: AuthUser, reason: Optional[str]) -> _TransitionPlan:
     if user.role_code not in ROLE_ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    if request_obj.status in TERMINAL_STATUSES:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request completed")
 
-    request_obj.status = STATUS_CANCELLED
+    values: dict[str, Any] = {"status": STATUS_CANCELLED}
     if reason:
-        request_obj.rejection_reason = reason
-
-    entity_type = "card_request" if request_type == "CARD" else "permit_request"
-    log_audit(
-        db,
-        entity_type=entity_type,
-        entity_id=request_obj.id,
+        values["rejection_reason"] = reason
+    return _TransitionPlan(
+        expected_statuses=frozenset(CANCELLABLE_STATUSES),
+        values=values,
         action="CANCELLED",
-        performed_by_email=user.internal_email,
         metadata={"reason": reason} if reason else None,
+        manager_scoped=False,
     )
 
+
+def approve_request(db: Session, request_type: str, request_id: int, user: AuthUser) -> dict:
+    return _transition(db, request_type, request_id, user, _plan_approve(user))
+
+
+def reject_request(db: Session, request_type: str, request_id: int, user: AuthUser, reason: str) -> dict:
+    return _transition(db, request_type, request_id, user, _plan_reject(user, reason))
+
+
+def complete_request(db: Session, request_type: str, request_id: int, user: AuthUser) -> dict:
+    return _transition(db, request_type, request_id, user, _plan_complete(user))
+
+
+def cancel_request(db: Session, request_type: str, request_id: int, user: AuthUser, reason: str | None) -> dict:
+    return _transition(db, request_type, request_id, user, _plan_cancel(user, reason))
+
+
+BATCH_PLANNERS = {
+    "approve": lambda user, reason: _plan_approve(user),
+    "reject": _plan_reject,
+    "complete": lambda user, reason: _plan_complete(user),
+}
+
+
+def _load_batch_targets(db: Session, ids_by_kind: dict[str, set[int]]) -> dict[tuple[str, int], tuple[str, str]]:
+    conditions = [
+        and_(RequestIndex.request_kind == kind, RequestIndex.request_id.in_(ids))
+        for kind, ids in ids_by_kind.items()
+        if ids
+    ]
+    if not conditions:
+        return {}
+    query = select(
+        RequestIndex.request_kind, RequestIndex.request_id, RequestIndex.status, RequestIndex.employee_id
+    ).where(or_(*conditions))
+    return {
+        (kind, request_id): (status_value, employee_id)
+        for kind, request_id, status_value, employee_id in db.execute(query)
+    }
+
+
+def _apply_batch_group(
+    db: Session, request_type: str, request_ids: list[int], user: AuthUser, plan: _TransitionPlan
+) -> set[int]:
+    model = REQUEST_MODELS[request_type]
+    conditions = [model.status.in_(plan.expected_statuses)]
+    if plan.manager_scoped:
+        conditions.append(_manager_scope_clause(model, user))
+
+    if db.get_bind().dialect.update_returning:
+        statement = (
+            update(model)
+            .where(model.id.in_(request_ids), *conditions)
+            .values(**plan.values)
+            .returning(model.id)
+            .execution_options(synchronize_session=False)
+        )
+        return set(db.execute(statement).scalars())
+
+    updated = set()
+    for request_id in request_ids:
+        statement = (
+            update(model)
+            .where(model.id == request_id, *conditions)
+            .values(**plan.values)
+            .execution_options(synchronize_session=False)
+        )
+        if db.execute(statement).rowcount == 1:
+            updated.add(request_id)
+    return updated
+
+
+def apply_batch_actions(db: Session, items: list[dict], user: AuthUser) -> list[dict]:
+    results: list[dict] = [
+        {
+            "id": item["id"],
+            "type": None,
+            "action": item["action"],
+            "ok": False,
+            "status": None,
+            "status_code": None,
+            "detail": None,
+        }
+        for item in items
+    ]
+
+    def _fail(index: int, exc: HTTPException) -> None:
+        results[index].update(status_code=exc.status_code, detail=exc.detail)
+
+    plans: dict[tuple[str, Optional[str]], _TransitionPlan | HTTPException] = {}
+    pending: list[tuple[int, Optional[str], tuple[str, Optional[str]]]] = []
+    ids_by_kind: dict[str, set[int]] = {kind: set() for kind in REQUEST_MODELS}
+    for index, item in enumerate(items):
+        plan_key = (item["action"], item.get("reason"))
+        if plan_key not in plans:
+            try:
+                plans[plan_key] = BATCH_PLANNERS[item["action"]](user, item.get("reason"))
+            except HTTPException as exc:
+                plans[plan_key] = exc
+        if isinstance(plans[plan_key], HTTPException):
+            _fail(index, plans[plan_key])
+            continue
+        try:
+            request_type = normalize_request_type(item.get("type"))
+        except HTTPException as exc:
+            _fail(index, exc)
+            continue
+        for kind in [request_type] if request_type else REQUEST_MODELS:
+            ids_by_kind[kind].add(item["id"])
+        pending.append((index, request_type, plan_key))
+
+    targets = _load_batch_targets(db, ids_by_kind)
+
+    departments: dict[str, int] = {}
+    if user.role_code in ROLE_MANAGER and targets:
+        employee_ids = {employee_id for _, employee_id in targets.values()} | {user.employee_id}
+        departments = employee_directory.departments_of(db, employee_ids)
+
+    groups: dict[tuple[str, tuple[str, Optional[str]]], list[int]] = {}
+    seen: set[tuple[str, int]] = set()
+    for index, request_type, plan_key in pending:
+        plan = plans[plan_key]
+        request_id = items[index]["id"]
+        kinds = [request_type] if request_type else [kind for kind in REQUEST_MODELS if (kind, request_id) in targets]
+        if len(kinds) > 1:
+            _fail(index, HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ambiguous request id"))
+            continue
+        target = targets.get((kinds[0], request_id)) if kinds else None
+        if target is None:
+            _fail(index, HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found"))
+            continue
+        request_type = kinds[0]
+        results[index]["type"] = request_type
+        current_status, employee_id = target
+        if plan.manager_scoped:
+            manager_department = departments.get(user.employee_id)
+            if manager_department is None or departments.get(employee_id) != manager_department:
+                _fail(index, HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden"))
+                continue
+        if current_status not in plan.expected_statuses:
+            _fail(index, _transition_conflict(current_status, plan))
+            continue
+        if (request_type, request_id) in seen:
+            _fail(index, HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate item"))
+            continue
+        seen.add((request_type, request_id))
+        groups.setdefault((request_type, plan_key), []).append(index)
+
+    for (request_type, plan_key), indexes in groups.items():
+        plan = plans[plan_key]
+        updated = _apply_batch_group(db, request_type, [items[index]["id"] for index in indexes], user, plan)
+        if updated:
+            sync_request_index(db, request_type, updated, plan.values["status"], plan.from_status)
+        for index in indexes:
+            request_id = items[index]["id"]
+            if request_id not in updated:
+                # Changed by someone else between the load and the update.
+                _fail(
+                    index,
+                    HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Request was updated by another user"),
+                )
+                continue
+            results[index].update(ok=True, status=plan.values["status"], status_code=status.HTTP_200_OK)
+            log_audit(
+                db,
+                entity_type=ENTITY_TYPES[request_type],
+                entity_id=request_id,
+                action=plan.action,
+                performed_by_email=user.internal_email,
+                metadata=plan.metadata,
+            )
+
     db.commit()
-    db.refresh(request_obj)
-    return request_obj
+    return results
@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, func, or_, select
+
+from app.core.config import settings
+from app.db.database import engine
+from app.models.auth_token import AuthToken
+from app.models.user_otp import UserOTP
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 1000
+
+
+def _purge_conditions(now: datetime) -> list[tuple[type, object]]:
+    # Each condition is served by one of the tables' indexes. Used OTPs go
+    # once they expire, otp_expire_minutes after they were sent.
+    return [
+        (UserOTP, UserOTP.expires_at < now),
+        (AuthToken, AuthToken.expires_at < now),
+        (AuthToken, AuthToken.revoked.is_(True)),
+    ]
+
+
+def purge_auth_rows(engine, batch_size: int = PURGE_BATCH_SIZE, now: Optional[datetime] = None) -> dict:
+    # Deletes expired OTPs and expired or revoked refresh tokens, one short
+    # transaction per batch of ids so no lock is held for long.
+    now = now or datetime.utcnow()
+    counts = {UserOTP.__tablename__: 0, AuthToken.__tablename__: 0}
+    for model, condition in _purge_conditions(now):
+        while True:
+            with engine.begin() as conn:
+                ids = conn.execute(select(model.id).where(condition).order_by(model.id).limit(batch_size)).scalars().all()
+                if ids:
+                    conn.execute(delete(model).where(model.id.in_(ids)))
+            counts[model.__tablename__] += len(ids)
+            if len(ids) < batch_size:
+                break
+    return counts
+
+
+def auth_row_counts(engine, now: Optional[datetime] = None) -> dict:
+    conditions = _purge_conditions(now or datetime.utcnow())
+    counts = {}
+    with engine.connect() as conn:
+        for model in (UserOTP, AuthToken):
+            purgeable = or_(*(condition for purged, condition in conditions if purged is model))
+            counts[model.__tablename__] = {
+                "rows": conn.execute(select(func.count()).select_from(model)).scalar_one(),
+                "purgeable": conn.execute(select(func.count()).select_from(model).where(purgeable)).scalar_one(),
+            }
+    return counts
+
+
+class AuthPurgeScheduler:
+    def __init__(self, interval_seconds: float, batch_size: int):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.failed_runs = 0
+        self.purged = {UserOTP.__tablename__: 0, AuthToken.__tablename__: 0}
+        self.last_run_seconds: Optional[float] = None
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="auth-purge", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout)
+
+    def run_once(self) -> dict:
+        started = time.perf_counter()
+        counts = purge_auth_rows(engine, self.batch_size)
+        self.last_run_seconds = round(time.perf_counter() - started, 3)
+        self.runs += 1
+        for table, count in counts.items():
+            self.purged[table] += count
+        return counts
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                counts = self.run_once()
+            except Exception:
+                self.failed_runs += 1
+                logger.exception("Failed to purge expired auth rows")
+                continue
+            if any(counts.values()):
+                logger.info("Purged expired auth rows: %s", counts)
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": self.interval_seconds,
+            "runs": self.runs,
+            "failed_runs": self.failed_runs,
+            "purged": dict(self.purged),
+            "last_run_seconds": self.last_run_seconds,
+        }
+
+
+auth_purge = AuthPurgeScheduler(
+    interval_seconds=settings.auth_purge_interval_seconds,
+    batch_size=settings.auth_purge_batch_size,
+)
@@ -1,9 +1,11 @@
 import hashlib
+import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -12,7 +14,8 @@ from app.models.employee import Employee
 from app.models.employee_permission import EmployeePermission
 from app.models.role import Role
 from app.models.user_otp import UserOTP
-from app.utils.email import send_email
+from app.utils.cache import TTLCache, invalidate_on_commit
+from app.utils.email import outbox
 from app.utils.otp import generate_otp
 from app.utils.otp_email import build_otp_email
 
@@ -29,6 +32,21 @@ class AuthUser:
     role_code: str
 
 
+principal_cache = TTLCache(settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds)
+
+
+def invalidate_principal_cache() -> None:
+    principal_cache.invalidate()
+
+
+invalidate_on_commit("principal_cache_dirty", (Employee, EmployeePermission, Role), invalidate_principal_cache)
+
+# Refresh token hash -> (email, revoked). The database stays authoritative:
+# rotation and logout are conditional updates, so a stale entry in another
+# worker only costs one extra statement.
+refresh_token_index = TTLCache(settings.refresh_token_index_max_entries, settings.refresh_token_expire_days * 86400)
+
+
 def _hash_token(token: str) -> str:
     return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
@@ -52,12 +70,25 @@ def create_refresh_token(user: AuthUser) -> tuple[str, datetime]:
         "role": user.role_code,
         "employee_id": user.employee_id,
         "type": "refresh",
+        "jti": uuid.uuid4().hex,
         "exp": expire,
     }
     token = jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
     return token, expire
 
 
+def _issue_refresh_token(db: Session, user: AuthUser) -> str:
+    refresh_token, refresh_exp = create_refresh_token(user)
+    token_record = AuthToken(
+        internal_email=user.internal_email,
+        token_hash=_hash_token(refresh_token),
+        expires_at=refresh_exp,
+        revoked=False,
+    )
+    db.add(token_record)
+    return refresh_token
+
+
 def _get_permission_by_email(db: Session, email: str) -> EmployeePermission | None:
     return (
         db.query(EmployeePermission)
@@ -107,10 +138,8 @@ def request_otp(db: Session, identifier: str) -> str:
     db.commit()
 
     subject, text_body, html_body = build_otp_email(otp_code)
-    try:
-        send_email(email, subject, text_body, html_body)
-    except Exception as exc:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to send OTP") from exc
+    if not outbox.enqueue(email, subject, text_body, html_body):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Failed to send OTP")
     return otp_code
 
 
@@ -141,20 +170,75 @@ def verify_otp(db: Session, identifier: str, otp: str) -> tuple[str, str, AuthUs
     user = AuthUser(internal_email=email, employee_id=permission.employee_id, role_code=role_code)
 
     access_token = create_access_token(user)
-    refresh_token, refresh_exp = create_refresh_token(user)
+    refresh_token = _issue_refresh_token(db, user)
+    db.commit()
+    refresh_token_index.set(_hash_token(refresh_token), (email, False))
 
-    token_record = AuthToken(
-        internal_email=email,
-        token_hash=_hash_token(refresh_token),
-        expires_at=refresh_exp,
-        revoked=False,
+    return access_token, refresh_token, user
+
+
+def _decode_refresh_token(token: str, verify_exp: bool = True) -> tuple[str, str]:
+    try:
+        payload = jwt.decode(
+            token,
+            settings.jwt_secret_key,
+            algorithms=[settings.jwt_algorithm],
+            options={"verify_exp": verify_exp},
+        )
+    except JWTError as exc:
+        raise AuthError("Invalid token") from exc
+    if payload.get("type") != "refresh":
+        raise AuthError("Invalid token type")
+    email = payload.get("sub")
+    if not email:
+        raise AuthError("Invalid token")
+    return email, _hash_token(token)
+
+
+def _revoke_token_row(db: Session, email: str, token_hash: str) -> bool:
+    result = db.execute(
+        update(AuthToken)
+        .where(
+            AuthToken.token_hash == token_hash,
+            AuthToken.internal_email == email,
+            AuthToken.revoked.is_(False),
+        )
+        .values(revoked=True)
+        .execution_options(synchronize_session=False)
     )
-    db.add(token_record)
-    db.commit()
+    return result.rowcount > 0
 
+
+def refresh_tokens(db: Session, token: str) -> tuple[str, str, AuthUser]:
+    email, token_hash = _decode_refresh_token(token)
+    indexed = refresh_token_index.get(token_hash)
+    if indexed is not None and (indexed[0] != email or indexed[1]):
+        raise AuthError("Token revoked")
+
+    user = _load_principal(db, email)
+    # Revoking first means only one of several concurrent refreshes wins.
+    if not _revoke_token_row(db, email, token_hash):
+        db.rollback()
+        refresh_token_index.set(token_hash, (email, True))
+        raise AuthError("Token revoked")
+    access_token = create_access_token(user)
+    refresh_token = _issue_refresh_token(db, user)
+    db.commit()
+    refresh_token_index.set(token_hash, (email, True))
+    refresh_token_index.set(_hash_token(refresh_token), (email, False))
     return access_token, refresh_token, user
 
 
+def revoke_refresh_token(db: Session, token: str) -> None:
+    # Expired tokens can still be revoked; logging out twice is a no-op.
+    email, token_hash = _decode_refresh_token(token, verify_exp=False)
+    indexed = refresh_token_index.get(token_hash)
+    if indexed is None or not indexed[1]:
+        _revoke_token_row(db, email, token_hash)
+        db.commit()
+    refresh_token_index.set(token_hash, (email, True))
+
+
 def decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
@@ -171,6 +255,13 @@ def get_user_from_token(db: Session, token: str) -> AuthUser:
     email = payload.get("sub")
     if not email:
         raise AuthError("Invalid token")
+    return _load_principal(db, email)
+
+
+def _load_principal(db: Session, email: str) -> AuthUser:
+    cached = principal_cache.get(email)
+    if cached is not None:
+        return cached
 
     permission = _get_permission_by_email(db, email)
     if not permission:
@@ -183,4 +274,6 @@ def get_user_from_token(db: Session, token: str) -> AuthUser:
 
     _ensure_employee_active(db, permission.employee_id)
 
-    return AuthUser(internal_email=email, employee_id=permission.employee_id, role_code=role_code)
+    user = AuthUser(internal_email=email, employee_id=permission.employee_id, role_code=role_code)
+    principal_cache.set(email, user)
+    return user
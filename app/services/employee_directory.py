@@ -0,0 +1,136 @@
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.employee import Employee
+from app.services.auth_service import AuthUser
+from app.utils.cache import invalidate_on_commit
+
+
+class EmployeeDirectory:
+    # employee_id -> department_id for every employee, loaded in one query and
+    # swapped in whole, so manager scope checks never hit the database.
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._departments: dict[str, int] = {}
+        self._inactive: frozenset[str] = frozenset()
+        self._department_names: dict[int, str] = {}
+        self._expires_at = 0.0
+        self.loaded_at: Optional[datetime] = None
+        self.loads = 0
+        self.load_ms = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def refresh(self, db: Session) -> None:
+        started = time.perf_counter()
+        departments: dict[str, int] = {}
+        inactive: set[str] = set()
+        department_names: dict[int, str] = {}
+        rows = db.execute(
+            select(Employee.employee_id, Employee.department_id, Employee.department_name, Employee.account_status)
+        )
+        for employee_id, department_id, department_name, account_status in rows:
+            departments[employee_id] = department_id
+            department_names.setdefault(department_id, department_name)
+            if account_status != "ACTIVE":
+                inactive.add(employee_id)
+        with self._lock:
+            self._departments = departments
+            self._inactive = frozenset(inactive)
+            self._department_names = department_names
+            self._expires_at = time.monotonic() + self.ttl_seconds
+            self.loaded_at = datetime.utcnow()
+            self.loads += 1
+            self.load_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+    def _ensure_loaded(self, db: Session) -> None:
+        if time.monotonic() >= self._expires_at:
+            self.refresh(db)
+
+    def department_of(self, db: Session, employee_id: str, active_only: bool = False) -> Optional[int]:
+        if not self.enabled:
+            row = db.execute(
+                select(Employee.department_id, Employee.account_status).where(Employee.employee_id == employee_id)
+            ).first()
+            if row is None or (active_only and row.account_status != "ACTIVE"):
+                return None
+            return row.department_id
+        self._ensure_loaded(db)
+        if active_only and employee_id in self._inactive:
+            return None
+        return self._departments.get(employee_id)
+
+    def departments_of(self, db: Session, employee_ids: set[str]) -> dict[str, int]:
+        if not self.enabled:
+            return dict(
+                db.execute(
+                    select(Employee.employee_id, Employee.department_id).where(Employee.employee_id.in_(employee_ids))
+                ).all()
+            )
+        self._ensure_loaded(db)
+        departments = self._departments
+        return {employee_id: departments[employee_id] for employee_id in employee_ids if employee_id in departments}
+
+    def department_name(self, db: Session, department_id: int) -> Optional[str]:
+        if not self.enabled:
+            return db.execute(
+                select(Employee.department_name).where(Employee.department_id == department_id).limit(1)
+            ).scalar()
+        self._ensure_loaded(db)
+        return self._department_names.get(department_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            departments = self._departments
+            inactive = self._inactive
+            department_names = self._department_names
+            loaded_at = self.loaded_at
+        approx_bytes = (
+            sys.getsizeof(departments)
+            + sum(sys.getsizeof(key) for key in departments)
+            + sys.getsizeof(inactive)
+            + sys.getsizeof(department_names)
+            + sum(sys.getsizeof(value) for value in department_names.values())
+        )
+        return {
+            "employees": len(departments),
+            "inactive": len(inactive),
+            "departments": len(department_names),
+            "approx_bytes": approx_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "loads": self.loads,
+            "last_load_ms": self.load_ms,
+            "loaded_at": loaded_at.isoformat() if loaded_at else None,
+        }
+
+
+employee_directory = EmployeeDirectory(settings.employee_directory_ttl_seconds)
+
+invalidate_on_commit("employee_directory_dirty", (Employee,), employee_directory.invalidate)
+
+
+def get_manager_department_id(db: Session, user: AuthUser) -> int:
+    department_id = employee_directory.department_of(db, user.employee_id, active_only=True)
+    if department_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
+    return department_id
+
+
+def ensure_manager_scope(db: Session, user: AuthUser, employee_id: str) -> None:
+    manager_department_id = employee_directory.department_of(db, user.employee_id, active_only=True)
+    if manager_department_id is None or employee_directory.department_of(db, employee_id) != manager_department_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
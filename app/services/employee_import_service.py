@@ -1,11 +1,18 @@
 import csv
-from io import StringIO
+import uuid
+from io import TextIOWrapper
 
 from fastapi import HTTPException, UploadFile, status
-from sqlalchemy import text
+from sqlalchemy import bindparam, delete, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.models.employee import Employee
+from app.models.employee_import_staging import EmployeeImportStaging
+from app.services.auth_service import invalidate_principal_cache
+from app.services.employee_directory import employee_directory
+from app.services.employee_search import employee_search_index
+from app.services.lookup_service import bump_lookup_version
+from app.services.request_index import move_employee_requests
 
 REQUIRED_HEADERS = {
     "MedID",
@@ -33,6 +40,21 @@ HEADER_MAP = {
     "EmpStatusName": "account_status",
 }
 
+# med_id is the identity primary key, so it is only written on insert.
+EMPLOYEE_FIELDS = (
+    "name_ar",
+    "name_en",
+    "job_title",
+    "nationality_ar",
+    "nationality_en",
+    "department_id",
+    "department_name",
+    "account_status",
+)
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ROWS = 20
+
 
 def _normalize_header(value: str) -> str:
     return value.strip().lstrip("﻿")
@@ -53,85 +75,215 @@ def _map_status(value: str) -> str:
     return "ACTIVE" if normalized == "على رأس العمل" else "SUSPENDED"
 
 
-def import_employees_from_csv(db: Session, file: UploadFile) -> dict:
-    if not file:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV file required")
-
-    content = file.file.read()
-    try:
-        text_content = content.decode("utf-8-sig")
-    except UnicodeDecodeError as exc:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid CSV encoding") from exc
-
-    reader = csv.DictReader(StringIO(text_content))
-    if not reader.fieldnames:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV headers missing")
+def _parse_row(row: dict, header_lookup: dict[str, str], row_number: int) -> dict:
+    med_id_value = row.get(header_lookup["MedID"], "").strip()
+    emp_id_value = row.get(header_lookup["EmpID"], "").strip()
 
-    header_lookup = {_normalize_header(name): name for name in reader.fieldnames}
-    missing = [name for name in REQUIRED_HEADERS if name not in header_lookup]
-    if missing:
+    if not med_id_value or not emp_id_value:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Missing columns: {', '.join(sorted(missing))}",
+            detail=f"Row {row_number}: MedID and EmpID are required",
         )
 
-    rows = []
-    seen_med_ids = set()
-    seen_employee_ids = set()
-
-    for row_number, row in enumerate(reader, start=2):
-        med_id_value = row.get(header_lookup["MedID"], "").strip()
-        emp_id_value = row.get(header_lookup["EmpID"], "").strip()
-
-        if not med_id_value or not emp_id_value:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Row {row_number}: MedID and EmpID are required",
-            )
-
-        med_id = _parse_int(med_id_value, "MedID", row_number)
-        department_id = _parse_int(
+    return {
+        "med_id": _parse_int(med_id_value, "MedID", row_number),
+        "employee_id": emp_id_value,
+        "name_ar": row.get(header_lookup["EmpNameAR"], "").strip(),
+        "name_en": row.get(header_lookup["EmpNameEN"], "").strip(),
+        "job_title": row.get(header_lookup["JobTitleNameSum"], "").strip(),
+        "nationality_ar": row.get(header_lookup["CountryNameAR"], "").strip(),
+        "nationality_en": row.get(header_lookup["CountryNameEN"], "").strip(),
+        "department_id": _parse_int(
             row.get(header_lookup["DepID"], "").strip(),
             "DepID",
             row_number,
-        )
+        ),
+        "department_name": row.get(header_lookup["DepartmentName"], "").strip(),
+        "account_status": _map_status(row.get(header_lookup["EmpStatusName"], "")),
+    }
+
+
+def _stage_rows(engine, file: UploadFile, import_id: str) -> int:
+    text_stream = TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text_stream)
+        try:
+            fieldnames = reader.fieldnames
+        except UnicodeDecodeError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid CSV encoding") from exc
+        if not fieldnames:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV headers missing")
 
-        if med_id in seen_med_ids:
+        header_lookup = {_normalize_header(name): name for name in fieldnames}
+        missing = [name for name in REQUIRED_HEADERS if name not in header_lookup]
+        if missing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Row {row_number}: duplicate MedID",
+                detail=f"Missing columns: {', '.join(sorted(missing))}",
             )
-        if emp_id_value in seen_employee_ids:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Row {row_number}: duplicate EmpID",
+
+        staged = 0
+        batch: list[dict] = []
+        seen_med_ids = set()
+        seen_employee_ids = set()
+        staging_insert = insert(EmployeeImportStaging.__table__)
+
+        try:
+            for row_number, row in enumerate(reader, start=2):
+                values = _parse_row(row, header_lookup, row_number)
+                if values["med_id"] in seen_med_ids:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Row {row_number}: duplicate MedID",
+                    )
+                if values["employee_id"] in seen_employee_ids:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Row {row_number}: duplicate EmpID",
+                    )
+                seen_med_ids.add(values["med_id"])
+                seen_employee_ids.add(values["employee_id"])
+
+                batch.append({**values, "import_id": import_id, "row_number": row_number})
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    with engine.begin() as conn:
+                        conn.execute(staging_insert, batch)
+                    staged += len(batch)
+                    batch = []
+        except UnicodeDecodeError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid CSV encoding") from exc
+
+        if batch:
+            with engine.begin() as conn:
+                conn.execute(staging_insert, batch)
+            staged += len(batch)
+        return staged
+    finally:
+        # Leave the upload's underlying file open for UploadFile to close.
+        text_stream.detach()
+
+
+def _merge_batch(conn, rows: list[dict]) -> tuple[int, int, int]:
+    employees = Employee.__table__
+    existing = {
+        row.employee_id: row
+        for row in conn.execute(
+            select(employees.c.employee_id, *[employees.c[field] for field in EMPLOYEE_FIELDS]).where(
+                employees.c.employee_id.in_([row["employee_id"] for row in rows])
             )
+        )
+    }
+
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    moved: dict[str, int] = {}
+    unchanged = 0
+    for row in rows:
+        values = {field: row[field] for field in EMPLOYEE_FIELDS}
+        current = existing.get(row["employee_id"])
+        if current is None:
+            inserts.append({"med_id": row["med_id"], "employee_id": row["employee_id"], **values})
+            # Picks up requests indexed while the employee row was missing.
+            moved[row["employee_id"]] = values["department_id"]
+        elif any(getattr(current, field) != values[field] for field in EMPLOYEE_FIELDS):
+            updates.append({"b_employee_id": row["employee_id"], **values})
+            if current.department_id != values["department_id"]:
+                moved[row["employee_id"]] = values["department_id"]
+        else:
+            unchanged += 1
 
-        seen_med_ids.add(med_id)
-        seen_employee_ids.add(emp_id_value)
-
-        rows.append(
-            {
-                "med_id": med_id,
-                "employee_id": emp_id_value,
-                "name_ar": row.get(header_lookup["EmpNameAR"], "").strip(),
-                "name_en": row.get(header_lookup["EmpNameEN"], "").strip(),
-                "job_title": row.get(header_lookup["JobTitleNameSum"], "").strip(),
-                "nationality_ar": row.get(header_lookup["CountryNameAR"], "").strip(),
-                "nationality_en": row.get(header_lookup["CountryNameEN"], "").strip(),
-                "department_id": department_id,
-                "department_name": row.get(header_lookup["DepartmentName"], "").strip(),
-                "account_status": _map_status(row.get(header_lookup["EmpStatusName"], "")),
-            }
+    if inserts:
+        conn.execute(insert(employees), inserts)
+    if updates:
+        conn.execute(
+            update(employees)
+            .where(employees.c.employee_id == bindparam("b_employee_id"))
+            .values({field: bindparam(field) for field in EMPLOYEE_FIELDS}),
+            updates,
         )
+    move_employee_requests(conn, moved)
+    return len(inserts), len(updates), unchanged
 
-    engine = db.get_bind()
+
+def _check_med_id_collisions(conn, import_id: str) -> None:
+    # A new EmpID may not take over the MedID of another existing employee.
+    staging = EmployeeImportStaging.__table__
+    employees = Employee.__table__
+    collisions = conn.execute(
+        select(staging.c.row_number, staging.c.med_id, employees.c.employee_id)
+        .join(employees, employees.c.med_id == staging.c.med_id)
+        .where(staging.c.import_id == import_id, employees.c.employee_id != staging.c.employee_id)
+        .order_by(staging.c.row_number)
+        .limit(MAX_REPORTED_ROWS)
+    ).all()
+    if collisions:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="; ".join(
+                f"Row {row_number}: MedID {med_id} belongs to EmpID {employee_id}"
+                for row_number, med_id, employee_id in collisions
+            ),
+        )
+
+
+def _merge_staged_rows(engine, import_id: str) -> dict:
+    # One transaction: a failure in any batch leaves employees untouched.
+    staging = EmployeeImportStaging.__table__
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    last_id = 0
     with engine.begin() as conn:
-        conn.execute(text("SET FOREIGN_KEY_CHECKS=0"))
-        Employee.__table__.drop(bind=conn, checkfirst=True)
-        Employee.__table__.create(bind=conn)
-        conn.execute(text("SET FOREIGN_KEY_CHECKS=1"))
-        if rows:
-            conn.execute(Employee.__table__.insert(), rows)
-
-    return {"imported": len(rows)}
+        _check_med_id_collisions(conn, import_id)
+        while True:
+            rows = [
+                dict(row)
+                for row in conn.execute(
+                    select(staging)
+                    .where(staging.c.import_id == import_id, staging.c.id > last_id)
+                    .order_by(staging.c.id)
+                    .limit(IMPORT_BATCH_SIZE)
+                ).mappings()
+            ]
+            if not rows:
+                break
+            inserted, updated, unchanged = _merge_batch(conn, rows)
+            counts["inserted"] += inserted
+            counts["updated"] += updated
+            counts["unchanged"] += unchanged
+            last_id = rows[-1]["id"]
+
+        # Employees missing from the file are suspended rather than deleted so
+        # existing requests keep a valid employee reference.
+        employees = Employee.__table__
+        in_file = select(staging.c.id).where(
+            staging.c.import_id == import_id, staging.c.employee_id == employees.c.employee_id
+        )
+        result = conn.execute(
+            update(employees)
+            .where(employees.c.account_status == "ACTIVE", ~in_file.exists())
+            .values(account_status="SUSPENDED")
+        )
+    counts["deactivated"] = result.rowcount
+    return counts
+
+
+def import_employees_from_csv(db: Session, file: UploadFile) -> dict:
+    if not file:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV file required")
+
+    engine = db.get_bind()
+    import_id = str(uuid.uuid4())
+    staging = EmployeeImportStaging.__table__
+    try:
+        staged = _stage_rows(engine, file, import_id)
+        counts = _merge_staged_rows(engine, import_id)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(staging).where(staging.c.import_id == import_id))
+        # Also after a failure, so the caches never disagree with employees.
+        invalidate_principal_cache()
+        if employee_directory.enabled:
+            employee_directory.refresh(db)
+        if employee_search_index.enabled:
+            employee_search_index.refresh(db)
+        bump_lookup_version()
+    return {"imported": staged, **counts}
@@ -0,0 +1,356 @@
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.employee import Employee
+from app.utils.cache import invalidate_on_commit
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLUMNS = (
+    Employee.employee_id,
+    Employee.name_ar,
+    Employee.name_en,
+    Employee.job_title,
+    Employee.department_id,
+    Employee.department_name,
+    Employee.account_status,
+)
+RESULT_FIELDS = tuple(column.key for column in SEARCH_COLUMNS)
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Letters NFKD leaves alone: alef wasla, alef maqsura, ta marbuta, Persian
+# yeh/kaf, tatweel and Arabic-Indic digits. Hamza carriers and accented Latin
+# letters decompose to a base letter plus a combining mark, dropped with the
+# Arabic diacritics by _MARKS.
+_FOLD = str.maketrans(
+    {
+        "ٱ": "ا",
+        "ى": "ي",
+        "ی": "ي",
+        "ة": "ه",
+        "ک": "ك",
+        "ـ": None,
+        **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+        **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+    }
+)
+_MARKS = re.compile("[\u0300-\u036f\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed]")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize_text(value: str) -> list[str]:
+    stripped = _MARKS.sub("", unicodedata.normalize("NFKD", value or ""))
+    return _SEPARATORS.sub(" ", stripped.translate(_FOLD).casefold()).split()
+
+
+@lru_cache(maxsize=100_000)
+def _token_grams(token: str) -> tuple[str, ...]:
+    # Every trigram of the token, plus its 2- and 3-character start markers
+    # (" a", " ab") so one- and two-letter terms match as word prefixes.
+    padded = " " + token
+    return (padded[:2], *(padded[index : index + 3] for index in range(len(padded) - 2)))
+
+
+def _term_grams(term: str) -> list[str]:
+    if len(term) < 3:
+        return [" " + term]
+    return [term[index : index + 3] for index in range(len(term) - 2)]
+
+
+class _IndexSnapshot:
+    # Trigram index over the active employees' id, names and department.
+    # Published snapshots are never modified: a refresh patches a copy, so
+    # searches read one without locking. Changed rows get their old entries
+    # tombstoned and new ones appended; _positions holds each document's place
+    # in name order so pages come out without sorting matches.
+    def __init__(self):
+        self.rows: list[Optional[tuple]] = []
+        self.texts: list[str] = []
+        self.sort_keys: list[str] = []
+        self.positions: list[int] = []
+        self.postings: dict[str, array] = {}
+        self.doc_ids: dict[str, int] = {}
+        self.id_keys: dict[str, int] = {}
+        self.dead: set[int] = set()
+        self._copied: Optional[set[str]] = None
+
+    @classmethod
+    def build(cls, rows) -> "_IndexSnapshot":
+        snapshot = cls()
+        for row in rows:
+            snapshot.add(row)
+        snapshot.sort()
+        return snapshot
+
+    def copy(self) -> "_IndexSnapshot":
+        # Posting arrays are shared until add() first appends to one.
+        snapshot = _IndexSnapshot()
+        snapshot.rows, snapshot.texts, snapshot.sort_keys = list(self.rows), list(self.texts), list(self.sort_keys)
+        snapshot.positions = self.positions
+        snapshot.postings = dict(self.postings)
+        snapshot.doc_ids, snapshot.id_keys, snapshot.dead = dict(self.doc_ids), dict(self.id_keys), set(self.dead)
+        snapshot._copied = set()
+        return snapshot
+
+    def add(self, row: tuple) -> None:
+        employee_id, name_ar, name_en, _job_title, _department_id, department_name, _status = row
+        tokens = normalize_text(f"{employee_id} {name_en} {name_ar} {department_name}")
+        doc_id = len(self.rows)
+        self.rows.append(row)
+        self.texts.append(" " + " ".join(tokens))
+        self.sort_keys.append(" ".join(normalize_text(name_en)))
+        self.doc_ids[employee_id] = doc_id
+        self.id_keys["".join(normalize_text(employee_id))] = doc_id
+        copied = self._copied
+        for gram in set().union(*map(_token_grams, tokens)):
+            postings = self.postings.get(gram)
+            if postings is None:
+                self.postings[gram] = array("I", (doc_id,))
+                if copied is not None:
+                    copied.add(gram)
+                continue
+            if copied is not None and gram not in copied:
+                postings = self.postings[gram] = array("I", postings)
+                copied.add(gram)
+            postings.append(doc_id)
+
+    def remove(self, employee_id: str) -> None:
+        doc_id = self.doc_ids.pop(employee_id)
+        self.id_keys.pop("".join(normalize_text(employee_id)), None)
+        self.rows[doc_id] = None
+        self.texts[doc_id] = ""
+        self.dead.add(doc_id)
+
+    def sort(self) -> None:
+        rows, sort_keys = self.rows, self.sort_keys
+        positions = [0] * len(rows)
+        live = sorted(self.doc_ids.values(), key=lambda doc_id: (sort_keys[doc_id], rows[doc_id][0]))
+        for position, doc_id in enumerate(live):
+            positions[doc_id] = position
+        self.positions = positions
+
+    def match(self, terms: list[str]) -> set[int]:
+        candidates: Optional[set[int]] = None
+        for term in terms:
+            postings = [self.postings.get(gram) for gram in _term_grams(term)]
+            if not all(postings):
+                return set()
+            # The two rarest grams narrow the candidates; terms longer than one
+            # trigram are confirmed with a substring check.
+            postings.sort(key=len)
+            term_ids = set(postings[0])
+            if len(postings) > 1:
+                term_ids.intersection_update(postings[1])
+            if len(term) > 3:
+                texts = self.texts
+                term_ids = {doc_id for doc_id in term_ids if term in texts[doc_id]}
+            candidates = term_ids if candidates is None else candidates & term_ids
+            if not candidates:
+                return set()
+        return candidates - self.dead
+
+    def word_starts(self, matches: set[int], terms: list[str]) -> set[int]:
+        # Short terms only ever match at a word start.
+        texts = self.texts
+        for term in terms:
+            if len(term) > 2:
+                needle = " " + term
+                matches = {doc_id for doc_id in matches if needle in texts[doc_id]}
+        return matches
+
+
+class EmployeeSearchIndex:
+    # Each refresh re-reads the table but only re-indexes rows that changed,
+    # rebuilding from scratch once tombstones pile up. Refreshes run on a
+    # background thread every ttl_seconds and soon after employee changes
+    # commit; the new snapshot is built outside _lock and swapped in under it.
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._snapshot: Optional[_IndexSnapshot] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self.loaded_at: Optional[datetime] = None
+        self.loads = 0
+        self.failed_loads = 0
+        self.load_ms = 0.0
+        self.last_changed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def refresh(self, db: Session) -> None:
+        with self._refresh_lock:
+            started = time.perf_counter()
+            current = {
+                row[0]: tuple(row)
+                for row in db.execute(select(*SEARCH_COLUMNS).where(Employee.account_status == "ACTIVE"))
+            }
+            # Only this thread replaces the snapshot while _refresh_lock is held.
+            previous = self._snapshot or _IndexSnapshot()
+            removed = [employee_id for employee_id in previous.doc_ids if employee_id not in current]
+            changed = [
+                row
+                for employee_id, row in current.items()
+                if employee_id not in previous.doc_ids or previous.rows[previous.doc_ids[employee_id]] != row
+            ]
+            snapshot = previous
+            if len(previous.dead) + len(removed) + len(changed) > max(1000, len(current) // 4):
+                snapshot = _IndexSnapshot.build(current.values())
+            elif removed or changed:
+                snapshot = previous.copy()
+                for employee_id in removed:
+                    snapshot.remove(employee_id)
+                for row in changed:
+                    if row[0] in snapshot.doc_ids:
+                        snapshot.remove(row[0])
+                    snapshot.add(row)
+                snapshot.sort()
+            with self._lock:
+                self._snapshot = snapshot
+                self.loaded_at = datetime.utcnow()
+                self.loads += 1
+                self.last_changed = len(removed) + len(changed)
+                self.load_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    def start(self) -> None:
+        # Starts the refresh thread and has it load the index right away.
+        if self.enabled:
+            self._ensure_started()
+            self._wake.set()
+
+    def invalidate(self) -> None:
+        self.start()
+
+    def _ensure_started(self) -> None:
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="employee-search", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.ttl_seconds)
+            if self._stop.is_set():
+                return
+            self._wake.clear()
+            db = SessionLocal()
+            try:
+                self.refresh(db)
+            except Exception:
+                self.failed_loads += 1
+                logger.exception("Failed to refresh the employee search index")
+            finally:
+                db.close()
+
+    def search(self, db: Session, query: str, limit: int, offset: int) -> tuple[list[dict], int]:
+        terms = normalize_text(query)
+        if not terms:
+            return [], 0
+        if not self.enabled:
+            return _search_database(db, query, limit, offset)
+        self._ensure_started()
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is None:
+            # Only the first searches of a process wait for the initial load.
+            with self._refresh_lock:
+                loaded = self._snapshot is not None
+            if not loaded:
+                self.refresh(db)
+            with self._lock:
+                snapshot = self._snapshot
+
+        matches = snapshot.match(terms)
+        # Exact id first, then matches at word starts, then the rest, each in name order.
+        exact = snapshot.id_keys.get("".join(terms))
+        tiers = [{exact} & matches]
+        tiers.append(snapshot.word_starts(matches - tiers[0], terms))
+        tiers.append(matches - tiers[0] - tiers[1])
+        page: list[int] = []
+        wanted = offset + limit
+        for tier in tiers:
+            page += heapq.nsmallest(wanted - len(page), tier, key=snapshot.positions.__getitem__)
+            if len(page) >= wanted:
+                break
+        rows = snapshot.rows
+        return [dict(zip(RESULT_FIELDS, rows[doc_id])) for doc_id in page[offset:]], len(matches)
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = self._snapshot or _IndexSnapshot()
+            return {
+                "employees": len(snapshot.doc_ids),
+                "tombstones": len(snapshot.dead),
+                "grams": len(snapshot.postings),
+                "postings": sum(len(postings) for postings in snapshot.postings.values()),
+                "ttl_seconds": self.ttl_seconds,
+                "loads": self.loads,
+                "failed_loads": self.failed_loads,
+                "last_load_ms": self.load_ms,
+                "last_changed": self.last_changed,
+                "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            }
+
+
+def _search_database(db: Session, query: str, limit: int, offset: int) -> tuple[list[dict], int]:
+    # Without the index: plain LIKE matching, so no Arabic folding.
+    conditions = [Employee.account_status == "ACTIVE"]
+    for term in query.split():
+        pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        conditions.append(
+            or_(
+                Employee.employee_id.ilike(pattern, escape="\\"),
+                Employee.name_ar.ilike(pattern, escape="\\"),
+                Employee.name_en.ilike(pattern, escape="\\"),
+                Employee.department_name.ilike(pattern, escape="\\"),
+            )
+        )
+    total = db.execute(select(func.count()).select_from(Employee).where(and_(*conditions))).scalar_one()
+    rows = db.execute(
+        select(*SEARCH_COLUMNS)
+        .where(and_(*conditions))
+        .order_by(Employee.name_en, Employee.employee_id)
+        .offset(offset)
+        .limit(limit)
+    ).all()
+    return [dict(zip(RESULT_FIELDS, row)) for row in rows], total
+
+
+employee_search_index = EmployeeSearchIndex(settings.employee_search_ttl_seconds)
+
+invalidate_on_commit("employee_search_dirty", (Employee,), employee_search_index.invalidate)
+
+
+def search_employees(db: Session, query: str, limit: int = DEFAULT_SEARCH_LIMIT, offset: int = 0) -> dict:
+    items, total = employee_search_index.search(db, query, limit, offset)
+    next_offset = offset + limit if offset + limit < total else None
+    return {"items": items, "total": total, "next_offset": next_offset}
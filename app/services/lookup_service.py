@@ -0,0 +1,92 @@
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.area import Area
+from app.models.employee import Employee
+from app.schemas.area import AreaRead
+from app.schemas.employee import EmployeeRead
+from app.utils.cache import TTLCache, invalidate_on_commit
+
+_AREAS_ADAPTER = TypeAdapter(list[AreaRead])
+_EMPLOYEE_ADAPTER = TypeAdapter(EmployeeRead)
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    body: bytes
+    etag: str
+
+
+# Per process: commits here drop it at once, other workers' changes and direct
+# SQL are picked up when entries expire, so keep the TTL short.
+lookup_cache = TTLCache(settings.lookup_cache_max_entries, settings.lookup_cache_ttl_seconds)
+_version_lock = threading.Lock()
+_version = 0
+
+
+def bump_lookup_version() -> None:
+    global _version
+    with _version_lock:
+        _version += 1
+        lookup_cache.invalidate()
+
+
+invalidate_on_commit("lookup_cache_dirty", (Area, Employee), bump_lookup_version)
+
+
+def _payload(body: bytes) -> CachedPayload:
+    # Derived from the body, so every worker hands out the same tag for the same data.
+    return CachedPayload(body=body, etag='"%s"' % hashlib.sha256(body).hexdigest()[:32])
+
+
+def _cached(key: tuple, load) -> CachedPayload:
+    payload = lookup_cache.get(key)
+    if payload is not None:
+        return payload
+    version = _version
+    payload = load()
+    with _version_lock:
+        # Skip the store if a bump raced with the load; the next call reloads.
+        if version == _version:
+            lookup_cache.set(key, payload)
+    return payload
+
+
+def get_areas_payload(db: Session, status_value: Optional[str]) -> CachedPayload:
+    area_status = status_value.upper() if status_value else "ACTIVE"
+
+    def load() -> CachedPayload:
+        rows = db.execute(
+            select(Area.area_id, Area.area_name).where(Area.status == area_status).order_by(Area.area_name)
+        ).all()
+        return _payload(_AREAS_ADAPTER.dump_json(_AREAS_ADAPTER.validate_python(rows, from_attributes=True)))
+
+    return _cached(("areas", area_status), load)
+
+
+def get_employee_payload(db: Session, employee_id: str) -> CachedPayload:
+    def load() -> CachedPayload:
+        row = db.execute(
+            select(
+                Employee.employee_id,
+                Employee.name_ar,
+                Employee.name_en,
+                Employee.job_title,
+                Employee.department_id,
+                Employee.department_name,
+                Employee.account_status,
+            ).where(Employee.employee_id == employee_id)
+        ).first()
+        if not row or row.account_status != "ACTIVE":
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
+        return _payload(_EMPLOYEE_ADAPTER.dump_json(_EMPLOYEE_ADAPTER.validate_python(row, from_attributes=True)))
+
+    return _cached(("employee", employee_id), load)
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+_PENDING_KEY = "pending_request_events"
+
+
+def record_request_events(db: Session, events: list[dict]) -> None:
+    # Buffered on the session and published once the transaction commits.
+    if events:
+        db.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+class RequestEventBroadcaster:
+    # Subscribers are coroutines on the server's event loop: publishing appends
+    # to a bounded buffer and wakes them all with one asyncio.Event, so idle
+    # streams cost no thread and no database connection.
+    def __init__(self, buffer_size: int, keepalive_seconds: float):
+        self.keepalive_seconds = keepalive_seconds
+        self.stream_id = format(time.time_ns(), "x")
+        self._events: deque[tuple[int, dict]] = deque(maxlen=buffer_size)
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None
+        self.subscribers = 0
+        self.published = 0
+
+    def publish(self, events: list[dict]) -> None:
+        with self._lock:
+            for payload in events:
+                self._sequence += 1
+                self._events.append((self._sequence, payload))
+            self.published += len(events)
+            loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._wake)
+            except RuntimeError:
+                # The loop has been closed.
+                pass
+
+    def _wake(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _since(self, sequence: int) -> tuple[list[tuple[int, dict]], int, bool]:
+        with self._lock:
+            missed = self._sequence - sequence
+            if missed <= 0:
+                return [], self._sequence, False
+            if missed > len(self._events):
+                return [], self._sequence, True
+            return [self._events[-offset] for offset in range(missed, 0, -1)], self._sequence, False
+
+    def _event_id(self, sequence: int) -> str:
+        return f"{self.stream_id}-{sequence}"
+
+    def _resume_from(self, last_event_id: Optional[str]) -> tuple[int, bool]:
+        with self._lock:
+            current = self._sequence
+        if not last_event_id:
+            return current, False
+        stream_id, _, sequence = last_event_id.rpartition("-")
+        if stream_id != self.stream_id or not sequence.isdigit() or int(sequence) > current:
+            # Issued before a restart: the events in between are gone.
+            return current, True
+        return int(sequence), False
+
+    async def stream(self, visible: Callable[[dict], bool], last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._changed = loop, asyncio.Event()
+        sequence, lost = self._resume_from(last_event_id)
+        self.subscribers += 1
+        try:
+            yield ": connected\n\n"
+            while True:
+                # Taken before reading so a publish in between still wakes us.
+                changed = self._changed
+                events, sequence, gap = self._since(sequence)
+                if lost or gap:
+                    yield f"id: {self._event_id(sequence)}\nevent: reset\ndata: {{}}\n\n"
+                    lost = False
+                for event_sequence, payload in events:
+                    if visible(payload):
+                        data = json.dumps(payload, separators=(",", ":"))
+                        yield f"id: {self._event_id(event_sequence)}\nevent: request\ndata: {data}\n\n"
+                try:
+                    await asyncio.wait_for(changed.wait(), self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            self.subscribers -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": self.subscribers,
+                "published": self.published,
+                "buffered": len(self._events),
+                "last_event_id": self._event_id(self._sequence),
+            }
+
+
+request_events = RequestEventBroadcaster(
+    buffer_size=settings.request_events_buffer_size,
+    keepalive_seconds=settings.request_events_keepalive_seconds,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_events(session: Session) -> None:
+    events = session.info.pop(_PENDING_KEY, None)
+    if events:
+        request_events.publish(events)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_events(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
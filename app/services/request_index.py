@@ -0,0 +1,254 @@
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import String, and_, bindparam, delete, exists, func, insert, literal, null, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.card_request import CardRequest
+from app.models.employee import Employee
+from app.models.permit_request import PermitRequest
+from app.models.request_index import RequestIndex
+from app.models.request_queue_count import RequestQueueCount
+from app.services.request_events import record_request_events
+
+REQUEST_KIND_MODELS = {"CARD": CardRequest, "ACCESS": PermitRequest}
+INDEX_COLUMNS = (
+    "request_id",
+    "request_kind",
+    "employee_id",
+    "department_id",
+    "submitted_by_employee_id",
+    "status",
+    "card_request_type",
+    "request_date",
+    "created_at",
+    "updated_at",
+)
+BACKFILL_BATCH_SIZE = 10000
+# Requests whose employee row is missing have a NULL department_id in
+# request_index; their queue counters are kept under this department id.
+NO_DEPARTMENT_ID = -1
+
+
+def _source(request_kind: str):
+    model = REQUEST_KIND_MODELS[request_kind]
+    return select(
+        model.id,
+        literal(request_kind, String(10)),
+        model.employee_id,
+        Employee.department_id,
+        model.submitted_by_employee_id,
+        model.status,
+        model.request_type if model is CardRequest else null(),
+        model.request_date,
+        model.created_at,
+        model.updated_at,
+    ).outerjoin(Employee, Employee.employee_id == model.employee_id)
+
+
+def _counter_department(department_id):
+    return NO_DEPARTMENT_ID if department_id is None else department_id
+
+
+def _queue_counts(db, *conditions) -> Counter:
+    department_id = func.coalesce(RequestIndex.department_id, NO_DEPARTMENT_ID)
+    rows = db.execute(
+        select(RequestIndex.status, department_id, func.count())
+        .where(*conditions)
+        .group_by(RequestIndex.status, department_id)
+    )
+    return Counter({(status_value, department_id): count for status_value, department_id, count in rows})
+
+
+def _adjust_queue_counts(db, before: Counter, after: Counter) -> None:
+    # Keys in a fixed order so concurrent transactions lock counter rows alike.
+    counts = RequestQueueCount.__table__
+    deltas = Counter()
+    for key, count in after.items():
+        deltas[key[0], _counter_department(key[1])] += count
+    for key, count in before.items():
+        deltas[key[0], _counter_department(key[1])] -= count
+    for status_value, department_id in sorted(deltas):
+        delta = deltas[status_value, department_id]
+        if not delta:
+            continue
+        increment = (
+            update(counts)
+            .where(counts.c.status == status_value, counts.c.department_id == department_id)
+            .values(request_count=counts.c.request_count + delta)
+        )
+        if db.execute(increment).rowcount:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(
+                    insert(counts).values(status=status_value, department_id=department_id, request_count=delta)
+                )
+        except IntegrityError:
+            # Another transaction created the row first.
+            db.execute(increment)
+
+
+def _index_statuses(db, *conditions) -> dict[int, tuple[str, int]]:
+    rows = db.execute(select(RequestIndex.request_id, RequestIndex.status, RequestIndex.department_id).where(*conditions))
+    return {request_id: (status_value, department_id) for request_id, status_value, department_id in rows}
+
+
+def _status_events(request_kind: str, before: dict, after: dict) -> list[dict]:
+    return [
+        {
+            "id": request_id,
+            "type": request_kind,
+            "old_status": before[request_id][0] if request_id in before else None,
+            "new_status": status_value,
+            "department_id": department_id,
+        }
+        for request_id, (status_value, department_id) in sorted(after.items())
+        if request_id not in before or before[request_id][0] != status_value
+    ]
+
+
+def index_request(db: Session, request_kind: str, request_id: int) -> None:
+    # Copied from the flushed row so server defaults (dates, status) match.
+    model = REQUEST_KIND_MODELS[request_kind]
+    db.execute(insert(RequestIndex).from_select(INDEX_COLUMNS, _source(request_kind).where(model.id == request_id)))
+    added = _index_statuses(db, RequestIndex.request_kind == request_kind, RequestIndex.request_id == request_id)
+    _adjust_queue_counts(db, Counter(), Counter(added.values()))
+    record_request_events(db, _status_events(request_kind, {}, added))
+
+
+def sync_request_index(
+    db: Session, request_kind: str, request_ids, new_status: str, old_status: Optional[str] = None
+) -> None:
+    # The caller's conditional UPDATE moved these requests to new_status, from
+    # old_status when it allowed only one. One UPDATE writes the index rows,
+    # copying updated_at, and returns their departments for the counters.
+    model = REQUEST_KIND_MODELS[request_kind]
+    conditions = (RequestIndex.request_kind == request_kind, RequestIndex.request_id.in_(list(request_ids)))
+    before = None if old_status else _index_statuses(db, *conditions)
+    statement = (
+        update(RequestIndex)
+        .where(*conditions)
+        .values(
+            status=new_status,
+            updated_at=select(model.updated_at).where(model.id == RequestIndex.request_id).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind().dialect.update_returning:
+        departments = dict(db.execute(statement.returning(RequestIndex.request_id, RequestIndex.department_id)).all())
+    else:
+        db.execute(statement)
+        departments = {
+            request_id: department_id for request_id, (_, department_id) in _index_statuses(db, *conditions).items()
+        }
+    if before is None:
+        before = {request_id: (old_status, department_id) for request_id, department_id in departments.items()}
+    after = {request_id: (new_status, department_id) for request_id, department_id in departments.items()}
+    _adjust_queue_counts(db, Counter(before.values()), Counter(after.values()))
+    record_request_events(db, _status_events(request_kind, before, after))
+
+
+def move_employee_requests(conn, departments: dict[str, int]) -> None:
+    if not departments:
+        return
+    index = RequestIndex.__table__
+    moved = RequestIndex.employee_id.in_(list(departments))
+    before = _queue_counts(conn, moved)
+    conn.execute(
+        update(index).where(index.c.employee_id == bindparam("b_employee_id")).values(department_id=bindparam("department_id")),
+        [{"b_employee_id": employee_id, "department_id": department_id} for employee_id, department_id in departments.items()],
+    )
+    _adjust_queue_counts(conn, before, _queue_counts(conn, moved))
+
+
+def _stale(request_kind: str):
+    # Index rows whose request is gone or differs from what _source would write.
+    model = REQUEST_KIND_MODELS[request_kind]
+    department_id = select(Employee.department_id).where(Employee.employee_id == model.employee_id).scalar_subquery()
+    current = exists().where(
+        model.id == RequestIndex.request_id,
+        department_id.is_not_distinct_from(RequestIndex.department_id),
+        model.employee_id == RequestIndex.employee_id,
+        model.status == RequestIndex.status,
+        model.request_date == RequestIndex.request_date,
+        model.submitted_by_employee_id.is_not_distinct_from(RequestIndex.submitted_by_employee_id),
+        model.updated_at.is_not_distinct_from(RequestIndex.updated_at),
+    )
+    return and_(RequestIndex.request_kind == request_kind, ~current)
+
+
+def _missing(request_kind: str):
+    model = REQUEST_KIND_MODELS[request_kind]
+    return ~exists().where(RequestIndex.request_kind == request_kind, RequestIndex.request_id == model.id)
+
+
+def _queue_count_drift(conn) -> int:
+    stored = Counter(
+        {
+            (status_value, department_id): count
+            for status_value, department_id, count in conn.execute(
+                select(RequestQueueCount.status, RequestQueueCount.department_id, RequestQueueCount.request_count)
+            )
+            if count
+        }
+    )
+    actual = _queue_counts(conn)
+    return sum(stored[key] != actual[key] for key in stored.keys() | actual.keys())
+
+
+def rebuild_queue_counts(conn) -> int:
+    counts = RequestQueueCount.__table__
+    department_id = func.coalesce(RequestIndex.department_id, NO_DEPARTMENT_ID)
+    conn.execute(delete(counts))
+    return conn.execute(
+        insert(counts).from_select(
+            ["status", "department_id", "request_count"],
+            select(RequestIndex.status, department_id, func.count()).group_by(RequestIndex.status, department_id),
+        )
+    ).rowcount
+
+
+def request_index_drift(engine) -> dict:
+    with engine.connect() as conn:
+        drift = {
+            request_kind: {
+                "missing": conn.execute(
+                    select(func.count()).select_from(model).where(_missing(request_kind))
+                ).scalar_one(),
+                "stale": conn.execute(
+                    select(func.count()).select_from(RequestIndex).where(_stale(request_kind))
+                ).scalar_one(),
+            }
+            for request_kind, model in REQUEST_KIND_MODELS.items()
+        }
+        drift["queue_counts"] = {"stale": _queue_count_drift(conn)}
+        return drift
+
+
+def backfill_request_index(engine, batch_size: int = BACKFILL_BATCH_SIZE) -> dict:
+    # Drops stale rows, then inserts every missing request in id-range batches,
+    # one transaction each, so it can be rerun safely and resumes where it
+    # stopped. The queue counters are recounted from the result.
+    counts = {"removed": 0, "inserted": 0, "queue_counts": 0}
+    with engine.begin() as conn:
+        counts["removed"] = conn.execute(
+            delete(RequestIndex).where(or_(*(_stale(request_kind) for request_kind in REQUEST_KIND_MODELS)))
+        ).rowcount
+    for request_kind, model in REQUEST_KIND_MODELS.items():
+        with engine.connect() as conn:
+            max_id = conn.execute(select(func.max(model.id))).scalar() or 0
+        for lower in range(0, max_id, batch_size):
+            with engine.begin() as conn:
+                counts["inserted"] += conn.execute(
+                    insert(RequestIndex).from_select(
+                        INDEX_COLUMNS,
+                        _source(request_kind).where(
+                            model.id > lower, model.id <= lower + batch_size, _missing(request_kind)
+                        ),
+                    )
+                ).rowcount
+    with engine.begin() as conn:
+        counts["queue_counts"] = rebuild_queue_counts(conn)
+    return counts
@@ -1,7 +1,12 @@
+import base64
+import json
+import operator
+from dataclasses import dataclass
 from datetime import date, datetime, time
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy import and_, func, null, or_, select
 from sqlalchemy.orm import Session
 
 from app.models.area import Area
@@ -9,7 +14,11 @@ from app.models.card_request import CardRequest
 from app.models.employee import Employee
 from app.models.permit_request import PermitRequest
 from app.models.permit_request_area import PermitRequestArea
+from app.models.request_index import RequestIndex
+from app.models.request_queue_count import RequestQueueCount
 from app.services.auth_service import AuthUser
+from app.services.employee_directory import employee_directory, ensure_manager_scope, get_manager_department_id
+from app.services.request_index import REQUEST_KIND_MODELS, index_request
 from app.utils.audit import log_audit
 
 STATUS_DRAFT = "DRAFT"
@@ -34,8 +43,19 @@ ROLE_ADMIN = {"ADMIN", "SYSTEM_ADMIN"}
 
 STAFF_ROLES = ROLE_MANAGER | ROLE_SECURITY | ROLE_CARD_PRINTING | ROLE_ADMIN
 
+# The status each role acts on next; admins see every queue.
+INBOX_QUEUES = {
+    STATUS_PENDING_MANAGER: ROLE_MANAGER,
+    STATUS_PENDING_SECURITY: ROLE_SECURITY,
+    STATUS_IN_PROCESS: ROLE_CARD_PRINTING,
+}
 
-def _normalize_request_type(request_type: Optional[str]) -> Optional[str]:
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+
+
+def normalize_request_type(request_type: Optional[str]) -> Optional[str]:
     if not request_type:
         return None
     value = request_type.strip().upper()
@@ -55,26 +75,14 @@ def _get_employee(db: Session, employee_id: str, active_only: bool = True) -> Em
     return employee
 
 
-def _get_manager_department_id(db: Session, user: AuthUser) -> int:
-    manager = _get_employee(db, user.employee_id, active_only=True)
-    return manager.department_id
-
-
 def _get_manager_department_info(db: Session, user: AuthUser) -> tuple[int, str]:
-    manager = _get_employee(db, user.employee_id, active_only=True)
-    return manager.department_id, manager.department_name
-
-
-def _ensure_manager_scope(db: Session, user: AuthUser, employee_id: str) -> None:
-    manager_department_id = _get_manager_department_id(db, user)
-    target_employee = _get_employee(db, employee_id, active_only=True)
-    if target_employee.department_id != manager_department_id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    department_id = get_manager_department_id(db, user)
+    return department_id, employee_directory.department_name(db, department_id) or ""
 
 
 def _ensure_staff_access(db: Session, user: AuthUser, employee_id: str) -> None:
     if user.role_code in ROLE_MANAGER:
-        _ensure_manager_scope(db, user, employee_id)
+        ensure_manager_scope(db, user, employee_id)
 
 
 def _apply_date_filter(query, model, date_from: Optional[date], date_to: Optional[date]):
@@ -100,7 +108,7 @@ def create_card_request(db: Session, payload: dict, user: AuthUser | None) -> Ca
     submitted_by = None
     if user:
         if user.role_code in ROLE_MANAGER:
-            _ensure_manager_scope(db, user, employee_id)
+            ensure_manager_scope(db, user, employee_id)
         elif user.role_code not in ROLE_ADMIN:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         submitted_by = user.employee_id
@@ -115,6 +123,7 @@ def create_card_request(db: Session, payload: dict, user: AuthUser | None) -> Ca
     )
     db.add(card)
     db.flush()
+    index_request(db, "CARD", card.id)
 
     log_audit(
         db,
@@ -141,7 +150,7 @@ def create_permit_request(db: Session, payload: dict, user: AuthUser | None) ->
     submitted_by = None
     if user:
         if user.role_code in ROLE_MANAGER:
-            _ensure_manager_scope(db, user, employee_id)
+            ensure_manager_scope(db, user, employee_id)
         elif user.role_code not in ROLE_ADMIN:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         submitted_by = user.employee_id
@@ -165,6 +174,7 @@ def create_permit_request(db: Session, payload: dict, user: AuthUser | None) ->
 
     for area_id in area_ids:
         db.add(PermitRequestArea(permit_request_id=permit.id, area_id=area_id))
+    index_request(db, "ACCESS", permit.id)
 
     log_audit(
         db,
@@ -180,10 +190,23 @@ def create_permit_request(db: Session, payload: dict, user: AuthUser | None) ->
     return permit
 
 
+def resolve_request_kind(db: Session, request_id: int, request_type: Optional[str] = None) -> str:
+    normalized = normalize_request_type(request_type)
+    if normalized:
+        return normalized
+
+    kinds = db.execute(select(RequestIndex.request_kind).where(RequestIndex.request_id == request_id)).scalars().all()
+    if len(kinds) > 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ambiguous request id")
+    if not kinds:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
+    return kinds[0]
+
+
 def get_request_by_id(
     db: Session, request_id: int, request_type: Optional[str] = None
 ) -> tuple[str, CardRequest | PermitRequest]:
-    normalized = _normalize_request_type(request_type)
+    normalized = resolve_request_kind(db, request_id, request_type)
 
     if normalized == "CARD":
         card = db.query(CardRequest).filter(CardRequest.id == request_id).first()
@@ -191,21 +214,10 @@ def get_request_by_id(
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
         return "CARD", card
 
-    if normalized == "ACCESS":
-        permit = db.query(PermitRequest).filter(PermitRequest.id == request_id).first()
-        if not permit:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
-        return "ACCESS", permit
-
-    card = db.query(CardRequest).filter(CardRequest.id == request_id).first()
     permit = db.query(PermitRequest).filter(PermitRequest.id == request_id).first()
-    if card and permit:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ambiguous request id")
-    if card:
-        return "CARD", card
-    if permit:
-        return "ACCESS", permit
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
+    if not permit:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
+    return "ACCESS", permit
 
 
 def _build_approvals_timeline(request_obj) -> list[dict]:
@@ -302,106 +314,297 @@ def get_request_detail(
     }
 
 
-def list_requests(
-    db: Session,
-    request_type: Optional[str] = None,
-    status_value: Optional[str] = None,
-    date_from: Optional[date] = None,
-    date_to: Optional[date] = None,
-    user: AuthUser | None = None,
-) -> list[dict]:
-    normalized = _normalize_request_type(request_type)
-    normalized_status = status_value.strip().upper() if status_value else None
+def _encode_cursor(request_date: datetime, request_kind: str, request_id: int) -> str:
+    raw = json.dumps([request_date.isoformat(), request_kind, request_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        request_date, request_kind, request_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(request_date), str(request_kind), int(request_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _apply_keyset_filter(query, after: tuple[datetime, str, int], oldest_first: bool = False):
+    # Rows are ordered by (request_date, request_kind, request_id), descending
+    # unless oldest_first; the plain date bound lets the date indexes seek
+    # instead of scanning.
+    after_date, after_kind, after_id = after
+    beyond, bound = (operator.gt, operator.ge) if oldest_first else (operator.lt, operator.le)
+    return query.filter(
+        bound(RequestIndex.request_date, after_date),
+        or_(
+            beyond(RequestIndex.request_date, after_date),
+            and_(
+                RequestIndex.request_date == after_date,
+                or_(
+                    beyond(RequestIndex.request_kind, after_kind),
+                    and_(RequestIndex.request_kind == after_kind, beyond(RequestIndex.request_id, after_id)),
+                ),
+            ),
+        ),
+    )
+
+
+def _apply_role_scope(query, user: AuthUser | None, manager_department_id: Optional[int]):
+    if user and user.role_code in ROLE_CARD_PRINTING:
+        query = query.filter(RequestIndex.status.in_(PRINTING_VISIBLE_STATUSES))
+    if manager_department_id is not None:
+        # Never matches a NULL department, so requests whose employee row is
+        # missing are listed and counted for the other roles only.
+        query = query.filter(RequestIndex.department_id == manager_department_id)
+    return query
+
+
+@dataclass(frozen=True)
+class _RequestScope:
+    request_type: Optional[str]
+    status: Optional[str]
+    date_from: Optional[date]
+    date_to: Optional[date]
+    user: AuthUser | None
+    manager_department_id: Optional[int]
+
 
+def _resolve_request_scope(
+    db: Session,
+    request_type: Optional[str],
+    status_value: Optional[str],
+    date_from: Optional[date],
+    date_to: Optional[date],
+    user: AuthUser | None,
+) -> _RequestScope:
     manager_department_id = None
     if user and user.role_code in ROLE_MANAGER:
-        manager_department_id = _get_manager_department_id(db, user)
-
-    items: list[dict] = []
-
-    if normalized in {None, "CARD"}:
-        query = db.query(CardRequest)
-        if normalized_status:
-            query = query.filter(CardRequest.status == normalized_status)
-        if user and user.role_code in ROLE_CARD_PRINTING:
-            query = query.filter(CardRequest.status.in_(PRINTING_VISIBLE_STATUSES))
-        query = _apply_date_filter(query, CardRequest, date_from, date_to)
-        if manager_department_id is not None:
-            query = query.join(Employee, CardRequest.employee_id == Employee.employee_id).filter(
-                Employee.department_id == manager_department_id
-            )
-        cards = query.all()
-        for card in cards:
-            items.append(
-                {
-                    "id": card.id,
-                    "request_type": "CARD",
-                    "employee_id": card.employee_id,
-                    "submitted_by_employee_id": card.submitted_by_employee_id,
-                    "status": card.status,
-                    "request_date": card.request_date,
-                    "created_at": card.created_at,
-                    "updated_at": card.updated_at,
-                    "card_request_type": card.request_type,
-                }
-            )
+        manager_department_id = get_manager_department_id(db, user)
+    return _RequestScope(
+        request_type=normalize_request_type(request_type),
+        status=status_value.strip().upper() if status_value else None,
+        date_from=date_from,
+        date_to=date_to,
+        user=user,
+        manager_department_id=manager_department_id,
+    )
+
+
+REQUEST_LIST_COLUMNS = (
+    RequestIndex.request_id.label("id"),
+    RequestIndex.request_kind.label("request_type"),
+    RequestIndex.employee_id,
+    RequestIndex.submitted_by_employee_id,
+    RequestIndex.status,
+    RequestIndex.request_date,
+    RequestIndex.created_at,
+    RequestIndex.updated_at,
+    RequestIndex.card_request_type,
+)
+
+
+def _filter_requests(
+    query,
+    scope: _RequestScope,
+    after: Optional[tuple[datetime, str, int]] = None,
+    oldest_first: bool = False,
+):
+    if scope.request_type:
+        query = query.filter(RequestIndex.request_kind == scope.request_type)
+    if scope.status:
+        query = query.filter(RequestIndex.status == scope.status)
+    query = _apply_date_filter(query, RequestIndex, scope.date_from, scope.date_to)
+    query = _apply_role_scope(query, scope.user, scope.manager_department_id)
+    if after is not None:
+        query = _apply_keyset_filter(query, after, oldest_first)
+    return query
 
-    if normalized in {None, "ACCESS"}:
-        query = db.query(PermitRequest)
-        if normalized_status:
-            query = query.filter(PermitRequest.status == normalized_status)
-        if user and user.role_code in ROLE_CARD_PRINTING:
-            query = query.filter(PermitRequest.status.in_(PRINTING_VISIBLE_STATUSES))
-        query = _apply_date_filter(query, PermitRequest, date_from, date_to)
-        if manager_department_id is not None:
-            query = query.join(Employee, PermitRequest.employee_id == Employee.employee_id).filter(
-                Employee.department_id == manager_department_id
-            )
-        permits = query.all()
-        for permit in permits:
-            items.append(
-                {
-                    "id": permit.id,
-                    "request_type": "ACCESS",
-                    "employee_id": permit.employee_id,
-                    "submitted_by_employee_id": permit.submitted_by_employee_id,
-                    "status": permit.status,
-                    "request_date": permit.request_date,
-                    "created_at": permit.created_at,
-                    "updated_at": permit.updated_at,
-                    "card_request_type": None,
-                }
-            )
 
-    items.sort(key=lambda item: item["request_date"], reverse=True)
+EMPLOYEE_LIST_COLUMNS = (
+    Employee.employee_id,
+    Employee.name_ar,
+    Employee.name_en,
+    Employee.job_title,
+    Employee.department_id,
+    Employee.department_name,
+    Employee.account_status,
+)
+
+
+def _attach_employees(db: Session, items: list[dict]) -> list[dict]:
+    # Plain dicts of the EmployeeRead fields rather than ORM instances.
     employee_ids = list({item["employee_id"] for item in items})
     employees = {}
     if employee_ids:
-        employee_rows = db.query(Employee).filter(Employee.employee_id.in_(employee_ids)).all()
-        employees = {row.employee_id: row for row in employee_rows}
+        employee_rows = db.execute(
+            select(*EMPLOYEE_LIST_COLUMNS).filter(Employee.employee_id.in_(employee_ids))
+        ).mappings()
+        employees = {row["employee_id"]: dict(row) for row in employee_rows}
 
     for item in items:
         item["employee"] = employees.get(item["employee_id"])
-
     return items
 
 
+def _fetch_request_items(
+    db: Session,
+    scope: _RequestScope,
+    after: Optional[tuple[datetime, str, int]] = None,
+    limit: Optional[int] = None,
+    oldest_first: bool = False,
+) -> list[dict]:
+    order = (RequestIndex.request_date, RequestIndex.request_kind, RequestIndex.request_id)
+    query = _filter_requests(select(*REQUEST_LIST_COLUMNS), scope, after, oldest_first).order_by(
+        *(column.asc() if oldest_first else column.desc() for column in order)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return [dict(row) for row in db.execute(query).mappings()]
+
+
+def list_requests_page(
+    db: Session,
+    request_type: Optional[str] = None,
+    status_value: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    user: AuthUser | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+) -> dict:
+    after = _decode_cursor(cursor) if cursor else None
+    scope = _resolve_request_scope(db, request_type, status_value, date_from, date_to, user)
+    items = _fetch_request_items(db, scope, after, limit=limit + 1)
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = _encode_cursor(last["request_date"], last["request_type"], last["id"])
+
+    total = None
+    if include_total:
+        total = db.execute(_filter_requests(select(func.count()).select_from(RequestIndex), scope)).scalar_one()
+
+    return {"items": _attach_employees(db, items), "next_cursor": next_cursor, "total": total}
+
+
+def _inbox_queues(user: AuthUser) -> list[str]:
+    if user.role_code in ROLE_ADMIN:
+        return list(INBOX_QUEUES)
+    return [queue for queue, roles in INBOX_QUEUES.items() if user.role_code in roles]
+
+
+def _inbox_department_id(db: Session, user: AuthUser) -> Optional[int]:
+    return get_manager_department_id(db, user) if user.role_code in ROLE_MANAGER else None
+
+
+def _count_inbox_queues(db: Session, queues: list[str], department_id: Optional[int]) -> dict[str, int]:
+    query = select(RequestQueueCount.status, func.sum(RequestQueueCount.request_count)).where(
+        RequestQueueCount.status.in_(queues)
+    )
+    if department_id is not None:
+        query = query.where(RequestQueueCount.department_id == department_id)
+    counts = dict.fromkeys(queues, 0)
+    for status_value, count in db.execute(query.group_by(RequestQueueCount.status)):
+        counts[status_value] = int(count or 0)
+    return counts
+
+
+def get_inbox_counts(db: Session, user: AuthUser) -> dict[str, int]:
+    return _count_inbox_queues(db, _inbox_queues(user), _inbox_department_id(db, user))
+
+
+def get_inbox_page(
+    db: Session,
+    user: AuthUser,
+    queue: Optional[str] = None,
+    request_type: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> dict:
+    queues = _inbox_queues(user)
+    if not queues:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    queue = queue.strip().upper() if queue else queues[0]
+    if queue not in INBOX_QUEUES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid queue")
+    if queue not in queues:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+    after = _decode_cursor(cursor) if cursor else None
+    department_id = _inbox_department_id(db, user)
+    scope = _RequestScope(
+        request_type=normalize_request_type(request_type),
+        status=queue,
+        date_from=None,
+        date_to=None,
+        user=user,
+        manager_department_id=department_id,
+    )
+    items = _fetch_request_items(db, scope, after, limit=limit + 1, oldest_first=True)
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = _encode_cursor(last["request_date"], last["request_type"], last["id"])
+
+    return {
+        "queue": queue,
+        "items": _attach_employees(db, items),
+        "next_cursor": next_cursor,
+        "counts": _count_inbox_queues(db, queues, department_id),
+    }
+
+
+def request_event_filter(db: Session, user: AuthUser, request_type: Optional[str] = None) -> Callable[[dict], bool]:
+    # The list's role scope applied to status change events; card printing
+    # also sees requests leaving its statuses.
+    request_kind = normalize_request_type(request_type)
+    department_id = get_manager_department_id(db, user) if user.role_code in ROLE_MANAGER else None
+    printing_only = user.role_code in ROLE_CARD_PRINTING
+
+    def visible(event: dict) -> bool:
+        if request_kind and event["type"] != request_kind:
+            return False
+        if department_id is not None and event["department_id"] != department_id:
+            return False
+        if printing_only and not {event["old_status"], event["new_status"]} & PRINTING_VISIBLE_STATUSES:
+            return False
+        return True
+
+    return visible
+
+
 def _aggregate_counts(
-    items: list[dict],
+    status_counts: dict[str, int],
     pending_statuses: set[str],
     approved_statuses: set[str],
     rejected_statuses: set[str],
 ) -> dict:
     counts = {"total": 0, "pending": 0, "approved": 0, "rejected": 0}
-    for item in items:
-        counts["total"] += 1
-        status = item.get("status")
-        if status in pending_statuses:
-            counts["pending"] += 1
-        elif status in approved_statuses:
-            counts["approved"] += 1
-        elif status in rejected_statuses:
-            counts["rejected"] += 1
+    for status_value, count in status_counts.items():
+        counts["total"] += count
+        if status_value in pending_statuses:
+            counts["pending"] += count
+        elif status_value in approved_statuses:
+            counts["approved"] += count
+        elif status_value in rejected_statuses:
+            counts["rejected"] += count
+    return counts
+
+
+def _count_by_kind_and_status(
+    db: Session, user: AuthUser, manager_department_id: Optional[int]
+) -> dict[str, dict[str, int]]:
+    query = select(RequestIndex.request_kind, RequestIndex.status, func.count())
+    query = _apply_role_scope(query, user, manager_department_id)
+
+    counts: dict[str, dict[str, int]] = {"CARD": {}, "ACCESS": {}}
+    for request_kind, status_value, count in db.execute(query.group_by(RequestIndex.request_kind, RequestIndex.status)):
+        counts[request_kind][status_value] = count
     return counts
 
 
@@ -409,10 +612,6 @@ def get_dashboard_summary(
     db: Session,
     user: AuthUser,
 ) -> dict:
-    all_items = list_requests(db, request_type=None, status_value=None, date_from=None, date_to=None, user=user)
-    card_items = [item for item in all_items if item["request_type"] == "CARD"]
-    access_items = [item for item in all_items if item["request_type"] == "ACCESS"]
-
     pending_statuses = PENDING_STATUSES
     approved_statuses = APPROVED_STATUSES
     rejected_statuses = REJECTED_STATUSES
@@ -422,132 +621,141 @@ def get_dashboard_summary(
         approved_statuses = {STATUS_COMPLETED}
         rejected_statuses = set()
 
+    manager_department_id = None
     if user.role_code in ROLE_MANAGER:
-        department_id, department_name = _get_manager_department_info(db, user)
-        scope = {"type": "DEPARTMENT", "department_id": department_id, "department_name": department_name}
+        manager_department_id, department_name = _get_manager_department_info(db, user)
+        scope = {"type": "DEPARTMENT", "department_id": manager_department_id, "department_name": department_name}
     else:
         scope = {"type": "ALL", "department_id": None, "department_name": None}
 
+    counts = _count_by_kind_and_status(db, user, manager_department_id)
+    all_counts: dict[str, int] = {}
+    for status_counts in counts.values():
+        for status_value, count in status_counts.items():
+            all_counts[status_value] = all_counts.get(status_value, 0) + count
+
     return {
         "scope": scope,
-        "all": _aggregate_counts(all_items, pending_statuses, approved_statuses, rejected_statuses),
-        "card": _aggregate_counts(card_items, pending_statuses, approved_statuses, rejected_statuses),
-        "access": _aggregate_counts(access_items, pending_statuses, approved_statuses, rejected_statuses),
+        "all": _aggregate_counts(all_counts, pending_statuses, approved_statuses, rejected_statuses),
+        "card": _aggregate_counts(counts["CARD"], pending_statuses, approved_statuses, rejected_statuses),
+        "access": _aggregate_counts(counts["ACCESS"], pending_statuses, approved_statuses, rejected_statuses),
     }
 
 
-def get_request_export_rows(
+def _attach_request_details(db: Session, items: list[dict]) -> None:
+    for request_kind, model in REQUEST_KIND_MODELS.items():
+        request_ids = [item["id"] for item in items if item["request_type"] == request_kind]
+        if not request_ids:
+            continue
+        rows = db.execute(
+            select(
+                model.id,
+                model.request_reason,
+                (model.photo_url if model is CardRequest else null()).label("photo_url"),
+                model.manager_employee_id,
+                model.manager_updated_at,
+                model.security_employee_id,
+                model.security_updated_at,
+                model.printing_employee_id,
+                model.printing_updated_at,
+                model.rejection_reason,
+            ).filter(model.id.in_(request_ids))
+        ).mappings()
+        details = {row["id"]: row for row in rows}
+        for item in items:
+            if item["request_type"] == request_kind:
+                item.update(details[item["id"]])
+
+
+def _iter_request_export_rows(db: Session, scope: _RequestScope, batch_size: int) -> Iterator[dict]:
+    after = None
+    while True:
+        items = _fetch_request_items(db, scope, after, limit=batch_size)
+        if not items:
+            return
+        _attach_request_details(db, items)
+
+        employee_ids = list({item["employee_id"] for item in items})
+        employee_rows = db.execute(
+            select(
+                Employee.employee_id,
+                Employee.name_ar,
+                Employee.name_en,
+                Employee.job_title,
+                Employee.nationality_ar,
+                Employee.nationality_en,
+                Employee.department_id,
+                Employee.department_name,
+                Employee.account_status,
+            ).filter(Employee.employee_id.in_(employee_ids))
+        ).mappings()
+        employees = {row["employee_id"]: row for row in employee_rows}
+
+        permit_ids = [item["id"] for item in items if item["request_type"] == "ACCESS"]
+        permit_area_ids: dict[int, list[int]] = {}
+        permit_area_names: dict[int, list[str]] = {}
+        if permit_ids:
+            area_rows = db.execute(
+                select(PermitRequestArea.permit_request_id, Area.area_id, Area.area_name)
+                .join(Area, PermitRequestArea.area_id == Area.area_id)
+                .filter(PermitRequestArea.permit_request_id.in_(permit_ids))
+                .order_by(PermitRequestArea.permit_request_id, Area.area_name)
+            )
+            for permit_id, area_id, area_name in area_rows:
+                permit_area_ids.setdefault(permit_id, []).append(area_id)
+                permit_area_names.setdefault(permit_id, []).append(area_name)
+
+        for item in items:
+            employee = employees.get(item["employee_id"]) or {}
+            is_card = item["request_type"] == "CARD"
+            yield {
+                "request_id": item["id"],
+                "request_type": item["request_type"],
+                "status": item["status"],
+                "request_date": item["request_date"],
+                "created_at": item["created_at"],
+                "updated_at": item["updated_at"],
+                "submitted_by_employee_id": item["submitted_by_employee_id"],
+                "employee_id": item["employee_id"],
+                "employee_name_ar": employee.get("name_ar"),
+                "employee_name_en": employee.get("name_en"),
+                "job_title": employee.get("job_title"),
+                "nationality_ar": employee.get("nationality_ar"),
+                "nationality_en": employee.get("nationality_en"),
+                "department_id": employee.get("department_id"),
+                "department_name": employee.get("department_name"),
+                "account_status": employee.get("account_status"),
+                "card_request_type": item["card_request_type"],
+                "card_request_reason": item["request_reason"] if is_card else None,
+                "photo_url": item["photo_url"],
+                "permit_request_reason": None if is_card else item["request_reason"],
+                "permit_area_ids": None if is_card else permit_area_ids.get(item["id"], []),
+                "permit_area_names": None if is_card else permit_area_names.get(item["id"], []),
+                "manager_employee_id": item["manager_employee_id"],
+                "manager_updated_at": item["manager_updated_at"],
+                "security_employee_id": item["security_employee_id"],
+                "security_updated_at": item["security_updated_at"],
+                "printing_employee_id": item["printing_employee_id"],
+                "printing_updated_at": item["printing_updated_at"],
+                "rejection_reason": item["rejection_reason"],
+            }
+
+        if len(items) < batch_size:
+            return
+        last = items[-1]
+        after = (last["request_date"], last["request_type"], last["id"])
+
+
+def iter_request_export_rows(
     db: Session,
     request_type: Optional[str],
     status_value: Optional[str],
     date_from: Optional[date],
     date_to: Optional[date],
     user: AuthUser,
-) -> list[dict]:
-    items = list_requests(
-        db,
-        request_type=request_type,
-        status_value=status_value,
-        date_from=date_from,
-        date_to=date_to,
-        user=user,
-    )
-
-    card_ids = [item["id"] for item in items if item["request_type"] == "CARD"]
-    permit_ids = [item["id"] for item in items if item["request_type"] == "ACCESS"]
-    employee_ids = list({item["employee_id"] for item in items})
-
-    cards = {}
-    if card_ids:
-        card_rows = db.query(CardRequest).filter(CardRequest.id.in_(card_ids)).all()
-        cards = {row.id: row for row in card_rows}
-
-    permits = {}
-    if permit_ids:
-        permit_rows = db.query(PermitRequest).filter(PermitRequest.id.in_(permit_ids)).all()
-        permits = {row.id: row for row in permit_rows}
-
-    employees = {}
-    if employee_ids:
-        employee_rows = db.query(Employee).filter(Employee.employee_id.in_(employee_ids)).all()
-        employees = {row.employee_id: row for row in employee_rows}
-
-    permit_area_ids: dict[int, list[int]] = {}
-    permit_area_names: dict[int, list[str]] = {}
-    if permit_ids:
-        area_rows = (
-            db.query(PermitRequestArea.permit_request_id, Area.area_id, Area.area_name)
-            .join(Area, PermitRequestArea.area_id == Area.area_id)
-            .filter(PermitRequestArea.permit_request_id.in_(permit_ids))
-            .order_by(PermitRequestArea.permit_request_id, Area.area_name)
-            .all()
-        )
-        for permit_id, area_id, area_name in area_rows:
-            permit_area_ids.setdefault(permit_id, []).append(area_id)
-            permit_area_names.setdefault(permit_id, []).append(area_name)
-
-    rows: list[dict] = []
-    for item in items:
-        employee = employees.get(item["employee_id"])
-
-        base = {
-            "request_id": item["id"],
-            "request_type": item["request_type"],
-            "status": item["status"],
-            "request_date": item["request_date"],
-            "created_at": item["created_at"],
-            "updated_at": item["updated_at"],
-            "submitted_by_employee_id": item["submitted_by_employee_id"],
-            "employee_id": item["employee_id"],
-            "employee_name_ar": getattr(employee, "name_ar", None),
-            "employee_name_en": getattr(employee, "name_en", None),
-            "job_title": getattr(employee, "job_title", None),
-            "nationality_ar": getattr(employee, "nationality_ar", None),
-            "nationality_en": getattr(employee, "nationality_en", None),
-            "department_id": getattr(employee, "department_id", None),
-            "department_name": getattr(employee, "department_name", None),
-            "account_status": getattr(employee, "account_status", None),
-        }
-
-        if item["request_type"] == "CARD":
-            card = cards.get(item["id"])
-            rows.append(
-                {
-                    **base,
-                    "card_request_type": getattr(card, "request_type", None),
-                    "card_request_reason": getattr(card, "request_reason", None),
-                    "photo_url": getattr(card, "photo_url", None),
-                    "permit_request_reason": None,
-                    "permit_area_ids": None,
-                    "permit_area_names": None,
-                    "manager_employee_id": getattr(card, "manager_employee_id", None),
-                    "manager_updated_at": getattr(card, "manager_updated_at", None),
-                    "security_employee_id": getattr(card, "security_employee_id", None),
-                    "security_updated_at": getattr(card, "security_updated_at", None),
-                    "printing_employee_id": getattr(card, "printing_employee_id", None),
-                    "printing_updated_at": getattr(card, "printing_updated_at", None),
-                    "rejection_reason": getattr(card, "rejection_reason", None),
-                }
-            )
-        else:
-            permit = permits.get(item["id"])
-            rows.append(
-                {
-                    **base,
-                    "card_request_type": None,
-                    "card_request_reason": None,
-                    "photo_url": None,
-                    "permit_request_reason": getattr(permit, "request_reason", None),
-                    "permit_area_ids": permit_area_ids.get(item["id"], []),
-                    "permit_area_names": permit_area_names.get(item["id"], []),
-                    "manager_employee_id": getattr(permit, "manager_employee_id", None),
-                    "manager_updated_at": getattr(permit, "manager_updated_at", None),
-                    "security_employee_id": getattr(permit, "security_employee_id", None),
-                    "security_updated_at": getattr(permit, "security_updated_at", None),
-                    "printing_employee_id": getattr(permit, "printing_employee_id", None),
-                    "printing_updated_at": getattr(permit, "printing_updated_at", None),
-                    "rejection_reason": getattr(permit, "rejection_reason", None),
-                }
-            )
-
-    return rows
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[dict]:
+    # Filters and scope are resolved eagerly so errors surface before streaming;
+    # rows are then fetched lazily in keyset-bounded batches.
+    scope = _resolve_request_scope(db, request_type, status_value, date_from, date_to, user)
+    return _iter_request_export_rows(db, scope, batch_size)
@@ -1,8 +1,18 @@
+import logging
+import threading
 from typing import Any, Optional
 
+from sqlalchemy import delete, event, func, insert, select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.db.database import engine
 from app.models.audit_log import AuditLog
+from app.models.audit_outbox import AuditOutbox
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_audit"
 
 
 def log_audit(
@@ -12,14 +22,125 @@ def log_audit(
     action: str,
     performed_by_email: Optional[str] = None,
     metadata: Optional[dict[str, Any]] = None,
-) -> AuditLog:
-    audit = AuditLog(
-        entity_type=entity_type,
-        entity_id=entity_id,
-        action=action,
-        performed_by_email=performed_by_email,
-        metadata_json=metadata,
+) -> None:
+    # Entries are buffered on the session and written when it commits.
+    db.info.setdefault(_PENDING_KEY, []).append(
+        {
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "action": action,
+            "performed_by_email": performed_by_email,
+            "metadata_json": metadata,
+        }
     )
-    db.add(audit)
-    db.flush()
-    return audit
+
+
+OUTBOX_COLUMNS = ("entity_type", "entity_id", "action", "performed_by_email", "metadata_json", "created_at")
+
+
+class _Contended(Exception):
+    pass
+
+
+class AuditWriter:
+    # Moves committed rows from audit_outbox into audit_logs in batches. A batch
+    # is copied and deleted in one transaction, so a failed attempt leaves its
+    # rows in the outbox for the next one and nothing accepted is dropped.
+    def __init__(self, flush_interval_seconds: float, batch_size: int):
+        self.flush_interval_seconds = flush_interval_seconds
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.batches = 0
+        self.failed_attempts = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout)
+
+    def flush_batch(self) -> int:
+        with engine.begin() as connection:
+            rows = [
+                dict(row)
+                for row in connection.execute(
+                    select(AuditOutbox.id, *(getattr(AuditOutbox, column).label(column) for column in OUTBOX_COLUMNS))
+                    .order_by(AuditOutbox.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                ).mappings()
+            ]
+            if not rows:
+                return 0
+            ids = [row.pop("id") for row in rows]
+            deleted = connection.execute(delete(AuditOutbox).where(AuditOutbox.id.in_(ids))).rowcount
+            if deleted != len(ids):
+                # Another worker moved some of these rows first.
+                raise _Contended()
+            connection.execute(insert(AuditLog), rows)
+        self.written += len(rows)
+        self.batches += 1
+        return len(rows)
+
+    def flush(self) -> None:
+        while True:
+            try:
+                if self.flush_batch() < self.batch_size:
+                    return
+            except _Contended:
+                continue
+            except Exception:
+                self.failed_attempts += 1
+                logger.exception("Failed to move audit entries from audit_outbox; retrying")
+                return
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval_seconds):
+            self.flush()
+        # One last pass; whatever is left stays in the outbox for the next start.
+        self.flush()
+
+    def stats(self) -> dict:
+        with engine.connect() as connection:
+            queued, oldest, now = connection.execute(
+                select(func.count(), func.min(AuditOutbox.created_at), func.now()).select_from(AuditOutbox)
+            ).one()
+        return {
+            "queued": queued,
+            "lag_seconds": round((now - oldest).total_seconds(), 3) if oldest is not None else 0.0,
+            "written": self.written,
+            "batches": self.batches,
+            "failed_attempts": self.failed_attempts,
+        }
+
+
+audit_writer = AuditWriter(
+    flush_interval_seconds=settings.audit_flush_interval_seconds,
+    batch_size=settings.audit_flush_batch_size,
+)
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_pending_audit(session: Session) -> None:
+    rows = session.info.pop(_PENDING_KEY, None)
+    if rows:
+        session.execute(insert(AuditOutbox if settings.audit_async_enabled else AuditLog), rows)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_audit(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
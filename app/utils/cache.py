@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Callable, Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class TTLCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def invalidate_on_commit(key: str, models: tuple[type, ...], callback: Callable[[], None]) -> None:
+    # Runs callback once after any commit that flushed a change to one of models.
+    @event.listens_for(Session, "after_flush")
+    def _track_changes(session: Session, flush_context) -> None:
+        for obj in chain(session.new, session.dirty, session.deleted):
+            if isinstance(obj, models):
+                session.info[key] = True
+                return
+
+    @event.listens_for(Session, "after_commit")
+    def _invalidate(session: Session) -> None:
+        if session.info.pop(key, False):
+            callback()
+
+    @event.listens_for(Session, "after_soft_rollback")
+    def _discard(session: Session, previous_transaction) -> None:
+        # A rolled-back savepoint leaves the outer transaction's changes pending.
+        if not previous_transaction.nested:
+            session.info.pop(key, None)
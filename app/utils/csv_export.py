@@ -1,6 +1,8 @@
 import csv
 from io import StringIO
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
+
+CSV_CHUNK_ROWS = 500
 
 
 def _format_value(value: Any) -> str:
@@ -13,10 +15,26 @@ def _format_value(value: Any) -> str:
     return str(value)
 
 
-def requests_to_csv(rows: Iterable[dict], headers: list[str]) -> bytes:
+def iter_requests_csv(rows: Iterable[dict], headers: list[str], chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[bytes]:
     buffer = StringIO()
     writer = csv.writer(buffer)
+
+    def _drain(encoding: str = "utf-8") -> bytes:
+        chunk = buffer.getvalue().encode(encoding)
+        buffer.seek(0)
+        buffer.truncate(0)
+        return chunk
+
     writer.writerow(headers)
+    yield _drain("utf-8-sig")
+
+    pending = 0
     for row in rows:
         writer.writerow([_format_value(row.get(key)) for key in headers])
-    return buffer.getvalue().encode("utf-8-sig")
+        pending += 1
+        if pending >= chunk_rows:
+            yield _drain()
+            pending = 0
+    if pending:
+        yield _drain()
+
@@ -1,14 +1,18 @@
+import logging
+import queue
 import smtplib
 import ssl
+import threading
+import time
+from dataclasses import dataclass
 from email.message import EmailMessage
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
 
-def send_email(to_email: str, subject: str, text_body: str, html_body: str | None = None) -> None:
-    if not settings.smtp_enabled:
-        return
 
+def _build_message(to_email: str, subject: str, text_body: str, html_body: str | None = None) -> EmailMessage:
     message = EmailMessage()
     message["Subject"] = subject
     message["From"] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
@@ -16,7 +20,10 @@ def send_email(to_email: str, subject: str, text_body: str, html_body: str | Non
     message.set_content(text_body)
     if html_body:
         message.add_alternative(html_body, subtype="html")
+    return message
+
 
+def _connect() -> smtplib.SMTP:
     if settings.smtp_use_ssl:
         context = ssl.create_default_context()
         server = smtplib.SMTP_SSL(
@@ -30,6 +37,138 @@ def send_email(to_email: str, subject: str, text_body: str, html_body: str | Non
             server.starttls(context=ssl.create_default_context())
         if settings.smtp_user:
             server.login(settings.smtp_user, settings.smtp_password)
-        server.send_message(message)
-    finally:
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def _disconnect(server: smtplib.SMTP | None) -> None:
+    if server is None:
+        return
+    try:
         server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+
+@dataclass(frozen=True)
+class _OutboundEmail:
+    to_email: str
+    subject: str
+    text_body: str
+    html_body: str | None
+
+
+_STOP = object()
+
+
+class EmailOutbox:
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        max_attempts: int,
+        retry_backoff_seconds: float,
+        idle_timeout_seconds: float,
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    def enqueue(self, to_email: str, subject: str, text_body: str, html_body: str | None = None) -> bool:
+        if not settings.smtp_enabled:
+            return True
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(_OutboundEmail(to_email, subject, text_body, html_body))
+        except queue.Full:
+            return False
+        return True
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            for index in range(len(self._threads), self.workers):
+                thread = threading.Thread(target=self._run, name=f"email-outbox-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "workers": sum(1 for thread in self._threads if thread.is_alive()),
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+    def _run(self) -> None:
+        # Each worker keeps one authenticated connection open while there is
+        # traffic and closes it after idle_timeout_seconds without mail.
+        server = None
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.idle_timeout_seconds)
+                except queue.Empty:
+                    _disconnect(server)
+                    server = None
+                    continue
+                try:
+                    if item is _STOP:
+                        return
+                    server = self._deliver(server, item)
+                finally:
+                    self._queue.task_done()
+        finally:
+            _disconnect(server)
+
+    def _deliver(self, server: smtplib.SMTP | None, item: _OutboundEmail) -> smtplib.SMTP | None:
+        message = _build_message(item.to_email, item.subject, item.text_body, item.html_body)
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                if server is None:
+                    server = _connect()
+                server.send_message(message)
+                self.sent += 1
+                return server
+            except smtplib.SMTPRecipientsRefused:
+                logger.error("OTP email rejected for %s", item.to_email)
+                self.failed += 1
+                return server
+            except (smtplib.SMTPException, OSError):
+                _disconnect(server)
+                server = None
+                if attempt == self.max_attempts:
+                    logger.exception("Failed to send OTP email to %s", item.to_email)
+                    self.failed += 1
+                    return None
+                self.retried += 1
+                time.sleep(self.retry_backoff_seconds * attempt)
+        return server
+
+
+outbox = EmailOutbox(
+    workers=settings.smtp_outbox_workers,
+    max_queue=settings.smtp_outbox_max_queue,
+    max_attempts=settings.smtp_send_max_attempts,
+    retry_backoff_seconds=settings.smtp_retry_backoff_seconds,
+    idle_timeout_seconds=settings.smtp_idle_timeout_seconds,
+)
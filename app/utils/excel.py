@@ -1,8 +1,23 @@
-from io import BytesIO
-from typing import Iterable
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, Iterable, Iterator
 
 from openpyxl import Workbook
 
+EXCEL_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+EXCEL_CHUNK_BYTES = 64 * 1024
+
+SUMMARY_COLUMNS = [
+    ("ID", "request_id"),
+    ("Type", "request_type"),
+    ("Employee ID", "employee_id"),
+    ("Submitted By", "submitted_by_employee_id"),
+    ("Status", "status"),
+    ("Card Request Type", "card_request_type"),
+    ("Request Date", "request_date"),
+    ("Created At", "created_at"),
+    ("Updated At", "updated_at"),
+]
+
 
 def _get_value(item, key):
     if isinstance(item, dict):
@@ -10,39 +25,35 @@ def _get_value(item, key):
     return getattr(item, key, None)
 
 
-def requests_to_excel(requests: Iterable[object]) -> bytes:
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Requests"
-
-    headers = [
-        "ID",
-        "Type",
-        "Employee ID",
-        "Submitted By",
-        "Status",
-        "Card Request Type",
-        "Request Date",
-        "Created At",
-        "Updated At",
-    ]
-    ws.append(headers)
-
-    for req in requests:
-        ws.append(
-            [
-                _get_value(req, "id"),
-                _get_value(req, "request_type"),
-                _get_value(req, "employee_id"),
-                _get_value(req, "submitted_by_employee_id"),
-                _get_value(req, "status"),
-                _get_value(req, "card_request_type"),
-                _get_value(req, "request_date"),
-                _get_value(req, "created_at"),
-                _get_value(req, "updated_at"),
-            ]
-        )
-
-    stream = BytesIO()
-    wb.save(stream)
-    return stream.getvalue()
+def _cell_value(value: Any) -> Any:
+    if isinstance(value, (list, tuple, set)):
+        return ",".join(str(item) for item in value)
+    return value
+
+
+def write_requests_excel(rows: Iterable[object], columns: list[tuple[str, str]]) -> IO[bytes]:
+    # Write-only worksheets stream rows to disk instead of keeping a cell object
+    # per value, so memory stays flat regardless of the number of rows.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Requests")
+    ws.append([header for header, _ in columns])
+    for row in rows:
+        ws.append([_cell_value(_get_value(row, key)) for _, key in columns])
+
+    spool = SpooledTemporaryFile(max_size=EXCEL_SPOOL_MAX_BYTES)
+    try:
+        wb.save(spool)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def iter_file_chunks(file_obj: IO[bytes], chunk_size: int = EXCEL_CHUNK_BYTES) -> Iterator[bytes]:
+    try:
+        while chunk := file_obj.read(chunk_size):
+            yield chunk
+    finally:
+        file_obj.close()
+
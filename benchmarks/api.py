@@ -0,0 +1,252 @@
+"""Time the main API paths against a seeded synthetic SQLite database.
+
+Requests go through the FastAPI app in-process (TestClient), so routing,
+auth, validation and serialization are included. SQL statement counts come
+from the Server-Timing header, so for the streamed CSV export they only cover
+work done before the body starts:
+
+    python -m benchmarks.api --employees 5000 --cards 20000 --permits 20000 --output before.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Optional
+
+from benchmarks.dataset import DatasetSpec, employee_id, employees_csv, seed, use_sqlite
+
+_QUERIES_RE = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _summarize(durations: list[float], queries: list[int]) -> dict:
+    return {
+        "runs": len(durations),
+        "mean_ms": round(statistics.fmean(durations), 3),
+        "p50_ms": round(_percentile(durations, 0.50), 3),
+        "p95_ms": round(_percentile(durations, 0.95), 3),
+        "min_ms": round(min(durations), 3),
+        "max_ms": round(max(durations), 3),
+        "queries": max(queries) if queries else None,
+    }
+
+
+class Runner:
+    def __init__(self, client, repeat: int, warmup: int):
+        self.client = client
+        self.repeat = repeat
+        self.warmup = warmup
+        self.results: dict[str, dict] = {}
+
+    def call(self, method: str, url: str, expected: int = 200, **kwargs):
+        response = self.client.request(method, url, **kwargs)
+        if response.status_code != expected:
+            raise RuntimeError(f"{method} {url} returned {response.status_code}: {response.text[:200]}")
+        return response
+
+    def measure(
+        self,
+        name: str,
+        request: Callable[[int], tuple],
+        repeat: Optional[int] = None,
+        before: Optional[Callable[[], None]] = None,
+        after: Optional[Callable[[object], None]] = None,
+    ) -> None:
+        # request(i) returns (method, url, kwargs); before() and after(response) run untimed.
+        repeat = repeat or self.repeat
+        durations: list[float] = []
+        queries: list[int] = []
+        for index in range(self.warmup + repeat):
+            if before:
+                before()
+            method, url, kwargs = request(index)
+            started = time.perf_counter()
+            response = self.call(method, url, **kwargs)
+            if response.headers.get("content-type", "").startswith("application/json"):
+                response.json()
+            else:
+                response.content
+            elapsed = (time.perf_counter() - started) * 1000
+            if after:
+                after(response)
+            if index < self.warmup:
+                continue
+            durations.append(elapsed)
+            match = _QUERIES_RE.search(response.headers.get("server-timing", ""))
+            if match:
+                queries.append(int(match.group(1)))
+        self.results[name] = _summarize(durations, queries)
+        print(f"{name}: {self.results[name]['p50_ms']} ms p50", file=sys.stderr)
+
+
+def run(spec: DatasetSpec, repeat: int, export_repeat: int, import_repeat: int, warmup: int) -> dict:
+    seed_started = time.perf_counter()
+    dataset = seed(spec)
+    seed_seconds = round(time.perf_counter() - seed_started, 2)
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.services.auth_service import invalidate_principal_cache
+
+    client = TestClient(app)
+    runner = Runner(client, repeat, warmup)
+
+    headers = {}
+    for role, email in dataset.accounts.items():
+        token = runner.call("POST", "/auth/verify-otp", json={"email": email, "otp": "123456"}).json()["access_token"]
+        headers[role] = {"Authorization": f"Bearer {token}"}
+
+    def get(url: str, role: str = "admin"):
+        return lambda index: ("GET", url, {"headers": headers[role]})
+
+    runner.measure("auth_me_cached", get("/auth/me"))
+    runner.measure("auth_me_uncached", get("/auth/me"), before=invalidate_principal_cache)
+
+    runner.measure("list_requests_admin", get("/requests?limit=50"))
+    runner.measure("list_requests_admin_with_total", get("/requests?limit=50&include_total=true"))
+    runner.measure("list_requests_manager", get("/requests?limit=50", "manager"))
+    runner.measure("list_requests_filtered", get("/requests?type=ACCESS&status=PENDING_SECURITY_APPROVAL&limit=50"))
+
+    first_page = runner.call("GET", "/requests?limit=50", headers=headers["admin"]).json()
+    runner.measure("list_requests_second_page", get(f"/requests?limit=50&cursor={first_page['next_cursor']}"))
+
+    runner.measure("dashboard_admin", get("/reports/dashboard/summary"))
+    runner.measure("dashboard_manager", get("/reports/dashboard/summary", "manager"))
+
+    runner.measure(
+        "request_detail_access",
+        lambda index: ("GET", f"/requests/{1 + (index * 7919) % spec.permits}?type=ACCESS", {"headers": headers["admin"]}),
+    )
+    runner.measure(
+        "request_detail_card",
+        lambda index: ("GET", f"/requests/{1 + (index * 7919) % spec.cards}?type=CARD", {"headers": headers["admin"]}),
+    )
+
+    def search(query: str):
+        return lambda index: ("GET", "/employees/search", {"headers": headers["admin"], "params": {"q": query}})
+
+    runner.measure("employee_search_arabic", search("موظف 12"))
+    runner.measure("employee_search_id", search(employee_id(spec.employees // 2)))
+    runner.measure("employee_search_broad", search("e"))
+
+    runner.measure("export_csv", get("/reports/requests/csv"), repeat=export_repeat)
+    runner.measure("export_excel", get("/reports/requests/excel"), repeat=export_repeat)
+
+    # Approval flow on fresh requests for employees in the manager's department.
+    managed = [employee_id(index) for index in range(spec.departments, spec.employees, spec.departments) if index % 50 != 49]
+    created: list[int] = []
+
+    def create_card(index: int):
+        return (
+            "POST",
+            "/requests/card",
+            {
+                "headers": headers["admin"],
+                "json": {"employee_id": managed[index % len(managed)], "request_type": "NEW", "request_reason": "Benchmark"},
+            },
+        )
+
+    runner.measure("create_card_request", create_card, after=lambda response: created.append(response.json()["id"]))
+
+    def transition(action: str, role: str):
+        return lambda index: ("POST", f"/requests/{created[index]}/{action}?type=CARD", {"headers": headers[role]})
+
+    runner.measure("approve_manager", transition("approve", "manager"))
+    runner.measure("approve_security", transition("approve", "security"))
+    runner.measure("complete_printing", transition("complete", "printing"))
+
+    batch_runs = warmup + 5
+    pending = runner.call(
+        "GET", "/requests?type=CARD&status=PENDING_MANAGER_APPROVAL&limit=500", headers=headers["manager"]
+    ).json()["items"]
+    batch_size = min(50, len(pending) // batch_runs)
+    if batch_size:
+        runner.measure(
+            "batch_approve_manager",
+            lambda index: (
+                "POST",
+                "/requests/batch",
+                {
+                    "headers": headers["manager"],
+                    "json": {
+                        "items": [
+                            {"id": item["id"], "type": "CARD", "action": "approve"}
+                            for item in pending[index * batch_size : (index + 1) * batch_size]
+                        ]
+                    },
+                },
+            ),
+            repeat=batch_runs - warmup,
+        )
+        runner.results["batch_approve_manager"]["items_per_batch"] = batch_size
+
+    csv_body = employees_csv(spec)
+    runner.measure(
+        "import_employees",
+        lambda index: (
+            "POST",
+            "/employees/import",
+            {"headers": headers["admin"], "files": {"file": ("employees.csv", csv_body, "text/csv")}},
+        ),
+        repeat=import_repeat,
+    )
+
+    return {
+        "benchmark": "api",
+        "dataset": dataset.summary(),
+        "config": {"repeat": repeat, "export_repeat": export_repeat, "import_repeat": import_repeat, "warmup": warmup},
+        "seed_seconds": seed_seconds,
+        "results": runner.results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = DatasetSpec()
+    parser.add_argument("--employees", type=int, default=defaults.employees)
+    parser.add_argument("--departments", type=int, default=defaults.departments)
+    parser.add_argument("--areas", type=int, default=defaults.areas)
+    parser.add_argument("--cards", type=int, default=defaults.cards)
+    parser.add_argument("--permits", type=int, default=defaults.permits)
+    parser.add_argument("--audits-per-request", type=int, default=defaults.audits_per_request)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--export-repeat", type=int, default=3)
+    parser.add_argument("--import-repeat", type=int, default=2)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--db", help="SQLite file to (re)create; defaults to a temporary file")
+    parser.add_argument("--output", help="Write the JSON result here instead of stdout")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="clearancehub-bench-"), "bench.db")
+    use_sqlite(db_path)
+    spec = DatasetSpec(
+        employees=args.employees,
+        departments=args.departments,
+        areas=args.areas,
+        cards=args.cards,
+        permits=args.permits,
+        audits_per_request=args.audits_per_request,
+        seed=args.seed,
+    )
+    result = run(spec, args.repeat, args.export_repeat, args.import_repeat, args.warmup)
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
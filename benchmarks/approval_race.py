@@ -0,0 +1,110 @@
+"""Check that exactly one of N concurrent approvals of the same request wins.
+
+Seeds a small synthetic SQLite database, creates a card request in the
+manager's department and has N threads send POST /requests/{id}/approve for it
+at the same moment, as the manager. Each round must produce one 200, N-1 409s
+and a single APPROVED audit row; the script exits non-zero otherwise. It also
+reports the SQL statements of the winning approval:
+
+    python -m benchmarks.approval_race --threads 8 --rounds 20
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+
+from benchmarks.dataset import DatasetSpec, employee_id, seed, use_sqlite
+
+_QUERIES_RE = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def _race(client, url: str, headers: dict, threads: int) -> list:
+    barrier = threading.Barrier(threads)
+    responses = [None] * threads
+
+    def approve(index: int) -> None:
+        barrier.wait()
+        responses[index] = client.post(url, headers=headers)
+
+    workers = [threading.Thread(target=approve, args=(index,)) for index in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return responses
+
+
+def run(spec: DatasetSpec, threads: int, rounds: int) -> dict:
+    dataset = seed(spec)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func, select
+
+    from app.db.database import engine
+    from app.main import app
+    from app.models import AuditLog
+
+    client = TestClient(app)
+    headers = {}
+    for role in ("admin", "manager"):
+        response = client.post("/auth/verify-otp", json={"email": dataset.accounts[role], "otp": "123456"})
+        headers[role] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    # Employee N shares department_id(0) with the manager (employee 0).
+    requester = employee_id(spec.departments)
+    failures = []
+    winner_queries = Counter()
+    for round_number in range(rounds):
+        created = client.post(
+            "/requests/card",
+            json={"employee_id": requester, "request_type": "NEW", "request_reason": "approval race"},
+            headers=headers["admin"],
+        )
+        request_id = created.json()["id"]
+        responses = _race(client, f"/requests/{request_id}/approve?type=CARD", headers["manager"], threads)
+        statuses = Counter(response.status_code for response in responses)
+        with engine.connect() as connection:
+            audits = connection.execute(
+                select(func.count()).select_from(AuditLog).where(
+                    AuditLog.entity_type == "card_request",
+                    AuditLog.entity_id == request_id,
+                    AuditLog.action == "APPROVED",
+                )
+            ).scalar_one()
+        for response in responses:
+            match = _QUERIES_RE.search(response.headers.get("server-timing", ""))
+            if response.status_code == 200 and match:
+                winner_queries[int(match.group(1))] += 1
+        if statuses != Counter({200: 1, 409: threads - 1}) or audits != 1:
+            failures.append({"round": round_number, "request_id": request_id, "statuses": dict(statuses), "audits": audits})
+
+    return {
+        "threads": threads,
+        "rounds": rounds,
+        "failures": failures,
+        "winner_statements": {str(statements): wins for statements, wins in sorted(winner_queries.items())},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--db", help="SQLite file to (re)create; defaults to a temporary file")
+    args = parser.parse_args()
+
+    use_sqlite(args.db or os.path.join(tempfile.mkdtemp(prefix="clearancehub-approval-race-"), "race.db"))
+    spec = DatasetSpec(employees=args.employees, cards=0, permits=0)
+    result = run(spec, args.threads, args.rounds)
+    print(json.dumps({"benchmark": "approval_race", **result}, indent=2))
+    if result["failures"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
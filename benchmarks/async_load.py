@@ -0,0 +1,200 @@
+"""Compare sync and async read endpoints under concurrent load.
+
+Seeds a synthetic SQLite database, then for each mode starts uvicorn in a
+subprocess (ASYNC_DB_ENABLED off/on) with a deliberately small threadpool and
+an injected per-statement database latency, and drives the dashboard and list
+endpoints with concurrent clients. Sync endpoints hand response validation to
+the same threadpool while their session still holds a pooled connection, so
+once concurrency exceeds the pool the sync stack can stall until
+DB_POOL_TIMEOUT_SECONDS; those requests are counted as errors. Needs aiosqlite,
+httpx and uvicorn:
+
+    python -m benchmarks.async_load --concurrency 8 32 64 --threads 8 --db-latency-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.dataset import DatasetSpec, seed, use_sqlite
+
+MODES = ("sync", "async")
+PATHS = ("/reports/dashboard/summary", "/requests?limit=50")
+
+
+def _install_latency(latency_ms: float) -> None:
+    # Sleep inside SQLite's statement trace hook. It runs on whichever thread
+    # executes the statement (the request thread for pysqlite, aiosqlite's
+    # worker for the async engine), which is where a network round trip waits.
+    from sqlalchemy import event
+    from sqlalchemy.util import await_only
+
+    from app.db.database import async_engine, engine
+
+    delay = latency_ms / 1000
+
+    def trace(statement: str) -> None:
+        time.sleep(delay)
+
+    @event.listens_for(engine, "connect")
+    def _sync_connect(dbapi_connection, connection_record) -> None:
+        dbapi_connection.set_trace_callback(trace)
+
+    if async_engine is not None:
+
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def _async_connect(dbapi_connection, connection_record) -> None:
+            await_only(dbapi_connection.driver_connection.set_trace_callback(trace))
+
+
+async def _serve(port: int, threads: int, latency_ms: float) -> None:
+    import anyio.to_thread
+    import uvicorn
+
+    _install_latency(latency_ms)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threads
+    config = uvicorn.Config("app.main:app", host="127.0.0.1", port=port, log_level="warning")
+    await uvicorn.Server(config).serve()
+
+
+async def _drive(base_url: str, token: str, concurrency: int, duration: float) -> dict:
+    import httpx
+
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+
+        async def worker(offset: int) -> None:
+            nonlocal errors
+            index = offset
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(PATHS[index % len(PATHS)])
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                finally:
+                    index += 1
+                if response.status_code == 200:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2], 1) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)], 1) if latencies else None,
+        "mean_ms": round(statistics.fmean(latencies), 1) if latencies else None,
+    }
+
+
+def _wait_until_up(base_url: str, timeout: float = 30) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def run_mode(mode: str, args, email: str) -> dict:
+    import httpx
+
+    env = {**os.environ, "ASYNC_DB_ENABLED": "true" if mode == "async" else "false", "REQUEST_TIMING_ENABLED": "false"}
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.async_load",
+            "--serve",
+            str(args.port),
+            "--db",
+            args.db,
+            "--threads",
+            str(args.threads),
+            "--db-latency-ms",
+            str(args.db_latency_ms),
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        _wait_until_up(base_url)
+        token = httpx.post(f"{base_url}/auth/verify-otp", json={"email": email, "otp": "123456"}).json()["access_token"]
+        # Warm the principal cache and employee directory one request at a time.
+        asyncio.run(_drive(base_url, token, 1, 1.0))
+        results = [asyncio.run(_drive(base_url, token, concurrency, args.duration)) for concurrency in args.concurrency]
+    finally:
+        server.terminate()
+        server.wait(10)
+    return {"mode": mode, "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 64])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--threads", type=int, default=8, help="AnyIO threadpool size of the server")
+    parser.add_argument("--db-latency-ms", type=float, default=20.0, help="added to every SQL statement")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--cards", type=int, default=10000)
+    parser.add_argument("--permits", type=int, default=10000)
+    parser.add_argument("--db", help="SQLite file to (re)create; defaults to a temporary file")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    args.db = args.db or os.path.join(tempfile.mkdtemp(prefix="clearancehub-load-"), "load.db")
+    use_sqlite(args.db)
+    if args.serve:
+        asyncio.run(_serve(args.serve, args.threads, args.db_latency_ms))
+        return
+
+    spec = DatasetSpec(employees=args.employees, cards=args.cards, permits=args.permits)
+    dataset = seed(spec)
+    runs = [run_mode(mode, args, dataset.accounts["manager"]) for mode in args.modes]
+    print(
+        json.dumps(
+            {
+                "benchmark": "async_load",
+                "dataset": dataset.summary(),
+                "config": {
+                    "threads": args.threads,
+                    "db_latency_ms": args.db_latency_ms,
+                    "duration_seconds": args.duration,
+                    "paths": PATHS,
+                },
+                "runs": runs,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Measure user_otp and auth_tokens sizes and verify_otp latency around a purge.
+
+Seeds a synthetic SQLite database and adds an OTP and refresh token history:
+mostly expired, used or revoked rows, spread over the staff accounts and a
+crowd of other addresses. Then it times verify_otp with real (non-fixed) OTP
+codes and the OTP lookup inside it, runs purge_auth_rows and times both again:
+
+    python -m benchmarks.auth_purge --history 200000 --account-history 5000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.dataset import DatasetSpec, _insert, seed, use_sqlite
+
+OTP_CODE = "654321"
+
+
+def _history(rng: random.Random, emails: list[str], rows: int, now: datetime) -> tuple[list[dict], list[dict]]:
+    otps, tokens = [], []
+    for _ in range(rows):
+        email = rng.choice(emails)
+        sent = now - timedelta(minutes=rng.randrange(90 * 24 * 60))
+        otps.append(
+            {
+                "internal_email": email,
+                "otp_code": f"{rng.randrange(10**6):06d}",
+                "expires_at": sent + timedelta(minutes=10),
+                "is_used": rng.random() < 0.7,
+                "created_at": sent,
+            }
+        )
+        issued = now - timedelta(days=rng.randrange(60))
+        tokens.append(
+            {
+                "internal_email": email,
+                "token_hash": f"{rng.getrandbits(256):064x}",
+                "expires_at": issued + timedelta(days=14),
+                "revoked": rng.random() < 0.3,
+                "created_at": issued,
+            }
+        )
+    return otps, tokens
+
+
+def _summary(samples: list[float]) -> dict:
+    samples.sort()
+    return {
+        "calls": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95)], 3),
+    }
+
+
+def _time_otp_lookup(accounts: list[str], repeat: int) -> dict:
+    # The latest-unused-OTP query verify_otp runs, on its own.
+    from app.db.database import SessionLocal
+    from app.models import UserOTP
+
+    samples = []
+    db = SessionLocal()
+    try:
+        for index in range(repeat):
+            started = time.perf_counter()
+            (
+                db.query(UserOTP)
+                .filter(UserOTP.internal_email == accounts[index % len(accounts)], UserOTP.is_used.is_(False))
+                .order_by(UserOTP.id.desc())
+                .first()
+            )
+            samples.append((time.perf_counter() - started) * 1000)
+            db.expunge_all()
+    finally:
+        db.close()
+    return _summary(samples)
+
+
+def _time_verify_otp(accounts: list[str], verifications: int) -> dict:
+    from app.db.database import SessionLocal, engine
+    from app.models import UserOTP
+    from app.services.auth_service import verify_otp
+
+    samples = []
+    for index in range(verifications):
+        email = accounts[index % len(accounts)]
+        with engine.begin() as connection:
+            connection.execute(
+                UserOTP.__table__.insert(),
+                {
+                    "internal_email": email,
+                    "otp_code": OTP_CODE,
+                    "expires_at": datetime.utcnow() + timedelta(minutes=10),
+                    "is_used": False,
+                },
+            )
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            verify_otp(db, email, OTP_CODE)
+            samples.append((time.perf_counter() - started) * 1000)
+        finally:
+            db.close()
+    return _summary(samples)
+
+
+def run(spec: DatasetSpec, history: int, account_history: int, emails: int, verifications: int, batch_size: int) -> dict:
+    from app.db.database import engine
+    from app.models import AuthToken, UserOTP
+    from app.services.auth_purge import auth_row_counts, purge_auth_rows
+
+    dataset = seed(spec)
+    accounts = list(dataset.accounts.values())
+    rng = random.Random(spec.seed)
+    now = datetime.utcnow()
+    crowd = [f"user{index}@bench.local" for index in range(emails)]
+    with engine.begin() as connection:
+        for pool, rows in ((crowd + accounts, history), (accounts, account_history * len(accounts))):
+            otps, tokens = _history(rng, pool, rows, now)
+            _insert(connection, UserOTP.__table__, otps)
+            _insert(connection, AuthToken.__table__, tokens)
+
+    def measure() -> dict:
+        return {
+            "tables": auth_row_counts(engine),
+            "otp_lookup": _time_otp_lookup(accounts, verifications),
+            "verify_otp": _time_verify_otp(accounts, verifications),
+        }
+
+    before = measure()
+    started = time.perf_counter()
+    deleted = purge_auth_rows(engine, batch_size)
+    purge = {"deleted": deleted, "seconds": round(time.perf_counter() - started, 3), "batch_size": batch_size}
+    after = measure()
+    return {"dataset": dataset.summary(), "before": before, "purge": purge, "after": after}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=200000, help="OTP and token rows spread over all addresses")
+    parser.add_argument("--account-history", type=int, default=5000, help="extra rows for each staff account")
+    parser.add_argument("--emails", type=int, default=2000, help="other addresses in the history")
+    parser.add_argument("--verifications", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--db", help="SQLite file to (re)create; defaults to a temporary file")
+    args = parser.parse_args()
+
+    os.environ["OTP_FIXED_ENABLED"] = "false"
+    use_sqlite(args.db or os.path.join(tempfile.mkdtemp(prefix="clearancehub-auth-purge-"), "auth_purge.db"))
+    spec = DatasetSpec(employees=args.employees, cards=0, permits=0)
+    result = run(spec, args.history, args.account_history, args.emails, args.verifications, args.batch_size)
+    print(json.dumps({"benchmark": "auth_purge", **result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
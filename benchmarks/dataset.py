@@ -0,0 +1,208 @@
+"""Seed a local SQLite database with a synthetic ClearanceHub population.
+
+Call use_sqlite() before anything from app is imported: settings are read
+once at import time.
+"""
+
+import os
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+
+REQUEST_STATUSES = (
+    "PENDING_MANAGER_APPROVAL",
+    "PENDING_SECURITY_APPROVAL",
+    "IN_PROCESS",
+    "COMPLETED",
+    "REJECTED_BY_MANAGER",
+    "REJECTED_BY_SECURITY",
+    "CANCELLED",
+    "DRAFT",
+)
+CARD_TYPES = ("NEW", "RENEW", "REPLACE_LOST")
+ROLES = ("DEPT_MANAGER", "SECURITY_OFFICER", "CARD_PRINTING", "ADMIN")
+ACTIVE_STATUS_LABEL = "على رأس العمل"
+INSERT_CHUNK = 5000
+
+
+@dataclass
+class DatasetSpec:
+    employees: int = 5000
+    departments: int = 50
+    areas: int = 50
+    cards: int = 20000
+    permits: int = 20000
+    audits_per_request: int = 2
+    seed: int = 1
+
+
+@dataclass
+class Dataset:
+    spec: DatasetSpec
+    accounts: dict[str, str] = field(default_factory=dict)
+    manager_department_id: int = 0
+
+    def summary(self) -> dict:
+        return {**asdict(self.spec), "accounts": self.accounts}
+
+
+def use_sqlite(path: str) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(path)}"
+    os.environ.setdefault("OTP_FIXED_ENABLED", "true")
+    os.environ.setdefault("SMTP_ENABLED", "false")
+    os.environ.setdefault("SLOW_QUERY_MS", "0")
+    # approval_race and api read statement counts from the Server-Timing header.
+    os.environ.setdefault("SERVER_TIMING_HEADER_ENABLED", "true")
+
+    from sqlalchemy import BigInteger
+    from sqlalchemy.ext.compiler import compiles
+
+    # SQLite only auto-increments INTEGER PRIMARY KEY columns.
+    @compiles(BigInteger, "sqlite")
+    def _big_integer_as_integer(type_, compiler, **kw):
+        return "INTEGER"
+
+
+def employee_id(index: int) -> str:
+    return f"E{100000 + index}"
+
+
+def department_id(index: int, departments: int) -> int:
+    return 10 * (1 + index % departments)
+
+
+def _insert(connection, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), INSERT_CHUNK):
+        connection.execute(table.insert(), rows[start : start + INSERT_CHUNK])
+
+
+def seed(spec: DatasetSpec) -> Dataset:
+    from app.db.database import Base, engine
+    from app.models import (
+        AuditLog,
+        Area,
+        CardRequest,
+        Employee,
+        EmployeePermission,
+        PermitRequest,
+        PermitRequestArea,
+        Role,
+    )
+    from app.services.request_index import backfill_request_index
+
+    rng = random.Random(spec.seed)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    dataset = Dataset(spec=spec, manager_department_id=department_id(0, spec.departments))
+    start = datetime(2024, 1, 1)
+    span_minutes = 2 * 365 * 24 * 60
+
+    def stamp() -> datetime:
+        return start + timedelta(minutes=rng.randrange(span_minutes))
+
+    with engine.begin() as connection:
+        _insert(connection, Role.__table__, [{"id": i + 1, "role_code": code, "role_name": code} for i, code in enumerate(ROLES)])
+        _insert(
+            connection,
+            Employee.__table__,
+            [
+                {
+                    "med_id": index + 1,
+                    "employee_id": employee_id(index),
+                    "name_ar": f"موظف {index}",
+                    "name_en": f"Employee {index}",
+                    "job_title": "Engineer",
+                    "nationality_ar": "سعودي",
+                    "nationality_en": "Saudi",
+                    "department_id": department_id(index, spec.departments),
+                    "department_name": f"Department {department_id(index, spec.departments)}",
+                    "account_status": "SUSPENDED" if index % 50 == 49 else "ACTIVE",
+                }
+                for index in range(spec.employees)
+            ],
+        )
+
+        # Employee 0 manages the first department; 1..3 hold the other staff roles.
+        staff = (("manager", 0), ("security", 1), ("printing", 2), ("admin", 3))
+        dataset.accounts = {role: f"{role}@bench.local" for role, _ in staff}
+        _insert(
+            connection,
+            EmployeePermission.__table__,
+            [
+                {"employee_id": employee_id(index), "internal_email": f"{role}@bench.local", "role_id": role_id, "is_active": True}
+                for role_id, (role, index) in enumerate(staff, 1)
+            ],
+        )
+        _insert(
+            connection,
+            Area.__table__,
+            [{"area_id": i + 1, "area_name": f"Area {i + 1:03d}", "status": "ACTIVE"} for i in range(spec.areas)],
+        )
+
+        cards = []
+        for index in range(spec.cards):
+            created = stamp()
+            cards.append(
+                {
+                    "id": index + 1,
+                    "employee_id": employee_id(rng.randrange(spec.employees)),
+                    "request_type": rng.choice(CARD_TYPES),
+                    "request_reason": "Synthetic",
+                    "status": rng.choice(REQUEST_STATUSES),
+                    "request_date": created,
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+        _insert(connection, CardRequest.__table__, cards)
+
+        permits = []
+        links = []
+        for index in range(spec.permits):
+            created = stamp()
+            permits.append(
+                {
+                    "id": index + 1,
+                    "employee_id": employee_id(rng.randrange(spec.employees)),
+                    "request_reason": "Synthetic",
+                    "status": rng.choice(REQUEST_STATUSES),
+                    "request_date": created,
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+            for area in rng.sample(range(1, spec.areas + 1), rng.randint(1, min(3, spec.areas))):
+                links.append({"permit_request_id": index + 1, "area_id": area})
+        _insert(connection, PermitRequest.__table__, permits)
+        _insert(connection, PermitRequestArea.__table__, links)
+
+        audits = [
+            {
+                "entity_type": entity_type,
+                "entity_id": row["id"],
+                "action": "CREATED" if step == 0 else "MANAGER_APPROVED",
+                "performed_by_email": dataset.accounts["admin"],
+                "metadata_json": {"request_type": kind},
+            }
+            for rows, entity_type, kind in ((cards, "card_request", "CARD"), (permits, "permit_request", "ACCESS"))
+            for row in rows
+            for step in range(spec.audits_per_request)
+        ]
+        _insert(connection, AuditLog.__table__, audits)
+
+    backfill_request_index(engine)
+    return dataset
+
+
+def employees_csv(spec: DatasetSpec, changed_every: int = 100) -> bytes:
+    # The current population in the import format, with every changed_every-th
+    # employee moved to another department so the import has work to do.
+    lines = ["MedID,EmpNameAR,EmpNameEN,CountryNameEN,CountryNameAR,DepID,DepartmentName,EmpID,EmpStatusName,JobTitleNameSum"]
+    for index in range(spec.employees):
+        department = department_id(index + 1 if index % changed_every == changed_every - 1 else index, spec.departments)
+        status = "موقوف" if index % 50 == 49 else ACTIVE_STATUS_LABEL
+        lines.append(
+            f"{index + 1},موظف {index},Employee {index},Saudi,سعودي,{department},"
+            f"Department {department},{employee_id(index)},{status},Engineer"
+        )
+    return ("\ufeff" + "\n".join(lines) + "\n").encode("utf-8")
@@ -0,0 +1,102 @@
+"""Compare the in-memory and write-only XLSX export paths.
+
+Each (mode, rows) case runs in its own interpreter so peak RSS is not shared
+between cases:
+
+    python -m benchmarks.excel_export --rows 10000 100000 500000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from io import BytesIO
+from typing import Iterator
+
+from openpyxl import Workbook
+
+from app.utils.excel import SUMMARY_COLUMNS, write_requests_excel
+
+MODES = ("in_memory", "write_only")
+
+
+def _synthetic_rows(count: int) -> Iterator[dict]:
+    start = datetime(2025, 1, 1)
+    for index in range(count):
+        stamp = start + timedelta(minutes=index)
+        yield {
+            "request_id": index + 1,
+            "request_type": "CARD" if index % 2 else "ACCESS",
+            "employee_id": f"E{100000 + index % 5000}",
+            "submitted_by_employee_id": f"E{100000 + index % 50}",
+            "status": "PENDING_MANAGER_APPROVAL",
+            "card_request_type": "NEW" if index % 2 else None,
+            "request_date": stamp,
+            "created_at": stamp,
+            "updated_at": stamp,
+        }
+
+
+def _in_memory_export(rows: Iterator[dict]) -> int:
+    # The pre-write-only path: every row is materialised, then kept as cells.
+    items = list(rows)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Requests"
+    ws.append([header for header, _ in SUMMARY_COLUMNS])
+    for item in items:
+        ws.append([item.get(key) for _, key in SUMMARY_COLUMNS])
+    stream = BytesIO()
+    wb.save(stream)
+    return len(stream.getvalue())
+
+
+def _write_only_export(rows: Iterator[dict]) -> int:
+    with write_requests_excel(rows, SUMMARY_COLUMNS) as spool:
+        spool.seek(0, 2)
+        return spool.tell()
+
+
+def run_case(mode: str, rows: int) -> dict:
+    export = _in_memory_export if mode == "in_memory" else _write_only_export
+    started = time.perf_counter()
+    size = export(_synthetic_rows(rows))
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": mode,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "bytes": size,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--case", nargs=2, metavar=("MODE", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case[0], int(args.case[1]))))
+        return
+
+    results = []
+    for rows in args.rows:
+        for mode in args.modes:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.excel_export", "--case", mode, str(rows)],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            results.append(json.loads(output.stdout))
+    print(json.dumps({"benchmark": "excel_export", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Measure memory and hydration time of request list, dashboard and export reads.
+
+Seeds a synthetic SQLite database and runs each read two ways:
+
+- columns: the service functions as they are. They select columns from
+  request_index and the request and employee tables into plain rows and dicts.
+- entities: the same rows loaded as full CardRequest, PermitRequest and
+  Employee ORM entities, including the TEXT columns, with the list fields
+  copied out. This is how the reads worked before. The dashboard loads every
+  request and counts statuses in Python, as it once did.
+
+For each read it reports the tracemalloc peak and retained bytes, the bytes
+per row, the wall time without tracing, and how many objects were left in the
+session's identity map:
+
+    python -m benchmarks.memory --page-size 500 --export-rows 5000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from itertools import islice
+
+from benchmarks.dataset import DatasetSpec, employee_id, seed, use_sqlite
+
+LIST_FIELDS = ("employee_id", "submitted_by_employee_id", "status", "request_date", "created_at", "updated_at")
+DETAIL_FIELDS = (
+    "request_reason",
+    "manager_employee_id",
+    "manager_updated_at",
+    "security_employee_id",
+    "security_updated_at",
+    "printing_employee_id",
+    "printing_updated_at",
+    "rejection_reason",
+)
+
+
+def _load_entities(db, items: list[dict], detailed: bool = False) -> list[dict]:
+    from app.models import CardRequest, Employee, PermitRequest
+
+    loaded = []
+    for request_kind, model in (("CARD", CardRequest), ("ACCESS", PermitRequest)):
+        request_ids = [item["id"] for item in items if item["request_type"] == request_kind]
+        for entity in db.query(model).filter(model.id.in_(request_ids)):
+            row = {"id": entity.id, "request_type": request_kind, **{field: getattr(entity, field) for field in LIST_FIELDS}}
+            row["card_request_type"] = entity.request_type if model is CardRequest else None
+            if detailed:
+                row.update({field: getattr(entity, field) for field in DETAIL_FIELDS})
+                row["photo_url"] = entity.photo_url if model is CardRequest else None
+            loaded.append(row)
+    loaded.sort(key=lambda row: (row["request_date"], row["request_type"], row["id"]), reverse=True)
+    employee_ids = list({row["employee_id"] for row in loaded})
+    employees = {row.employee_id: row for row in db.query(Employee).filter(Employee.employee_id.in_(employee_ids))}
+    for row in loaded:
+        row["employee"] = employees.get(row["employee_id"])
+    return loaded
+
+
+def _count_entities(db) -> dict:
+    from app.models import CardRequest, PermitRequest
+
+    return {
+        "card": Counter(entity.status for entity in db.query(CardRequest)),
+        "access": Counter(entity.status for entity in db.query(PermitRequest)),
+    }
+
+
+def _measure(db, rows: int, read) -> dict:
+    db.expunge_all()
+    read()
+    db.expunge_all()
+    started = time.perf_counter()
+    read()
+    elapsed = time.perf_counter() - started
+    db.expunge_all()
+
+    tracemalloc.start()
+    try:
+        result = read()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    tracked = len(db.identity_map)
+    del result
+    db.expunge_all()
+    return {
+        "rows": rows,
+        "ms": round(elapsed * 1000, 1),
+        "peak_kib": peak // 1024,
+        "retained_kib": retained // 1024,
+        "peak_bytes_per_row": peak // max(rows, 1),
+        "identity_map": tracked,
+    }
+
+
+def run(spec: DatasetSpec, page_size: int, export_rows: int) -> dict:
+    from app.db.database import SessionLocal
+    from app.services.auth_service import AuthUser
+    from app.services.request_service import get_dashboard_summary, iter_request_export_rows, list_requests_page
+
+    dataset = seed(spec)
+    admin = AuthUser(internal_email=dataset.accounts["admin"], employee_id=employee_id(3), role_code="ADMIN")
+    total_requests = spec.cards + spec.permits
+
+    db = SessionLocal()
+    try:
+        page = list_requests_page(db, user=admin, limit=page_size)["items"]
+        export = list(islice(iter_request_export_rows(db, None, None, None, None, admin), export_rows))
+        export_items = [{"id": row["request_id"], "request_type": row["request_type"]} for row in export]
+        cases = {
+            "list": (
+                len(page),
+                lambda: list_requests_page(db, user=admin, limit=page_size),
+                lambda: _load_entities(db, page),
+            ),
+            "dashboard": (
+                total_requests,
+                lambda: get_dashboard_summary(db, admin),
+                lambda: _count_entities(db),
+            ),
+            "export": (
+                len(export),
+                lambda: list(islice(iter_request_export_rows(db, None, None, None, None, admin), export_rows)),
+                lambda: _load_entities(db, export_items, detailed=True),
+            ),
+        }
+        results = []
+        for name, (rows, columns, entities) in cases.items():
+            measured = {"columns": _measure(db, rows, columns), "entities": _measure(db, rows, entities)}
+            results.append(
+                {
+                    "case": name,
+                    **measured,
+                    "peak_ratio": round(measured["entities"]["peak_kib"] / max(measured["columns"]["peak_kib"], 1), 2),
+                }
+            )
+    finally:
+        db.close()
+    return {"dataset": dataset.summary(), "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = DatasetSpec()
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--export-rows", type=int, default=5000)
+    parser.add_argument("--employees", type=int, default=defaults.employees)
+    parser.add_argument("--cards", type=int, default=defaults.cards)
+    parser.add_argument("--permits", type=int, default=defaults.permits)
+    parser.add_argument("--db", help="SQLite file to (re)create; defaults to a temporary file")
+    args = parser.parse_args()
+
+    use_sqlite(args.db or os.path.join(tempfile.mkdtemp(prefix="clearancehub-memory-"), "memory.db"))
+    spec = DatasetSpec(employees=args.employees, cards=args.cards, permits=args.permits)
+    print(json.dumps({"benchmark": "memory", **run(spec, args.page_size, args.export_rows)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
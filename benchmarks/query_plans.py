@@ -0,0 +1,303 @@
+"""Capture query plans for the request list, dashboard, export, inbox and import filters.
+
+Seeds a synthetic SQLite database, runs the service functions for each filter
+combination and role, and records the plan of every distinct statement they
+issue: the indexes used, full table scans and temporary sorts. --baseline
+first swaps the 0004 composite indexes back for the single-column ones so the
+two reports can be compared:
+
+    python -m benchmarks.query_plans --output after.json
+    python -m benchmarks.query_plans --baseline --output before.json
+
+--existing skips seeding and reads the configured DATABASE_URL instead
+(SQLite or SQL Server), without changing its indexes.
+"""
+
+import argparse
+import io
+import itertools
+import json
+import os
+import re
+import sys
+import tempfile
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date
+from typing import Callable
+
+from benchmarks.dataset import DatasetSpec, employee_id, employees_csv, seed, use_sqlite
+
+# (table, indexes 0004 dropped, indexes 0004 created)
+MIGRATION_0004 = (
+    (
+        "card_requests",
+        [("idx_card_req_status", ["status"]), ("idx_card_req_employee", ["employee_id"])],
+        ["idx_card_req_status_date", "idx_card_req_employee_date"],
+    ),
+    (
+        "permit_requests",
+        [("idx_permit_req_status", ["status"]), ("idx_permit_req_employee", ["employee_id"])],
+        ["idx_permit_req_status_date", "idx_permit_req_employee_date"],
+    ),
+    ("employees", [("idx_employees_department", ["department_id"])], ["idx_employees_department_employee"]),
+    ("employee_import_staging", [], ["idx_emp_import_staging_employee"]),
+)
+REQUEST_TABLES = {"card_requests", "permit_requests", "permit_request_areas", "request_index"}
+
+_SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)|USING (INTEGER PRIMARY KEY)")
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)$")
+_MSSQL_OPERATOR = re.compile(r"(Table Scan|Clustered Index Scan|Clustered Index Seek|Index Seek|Index Scan)\(OBJECT:\(([^)]*)\)")
+
+
+@contextmanager
+def captured_statements(engine):
+    from sqlalchemy import event
+
+    statements: dict[str, object] = {}
+
+    def _capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not executemany and not statement.lstrip().upper().startswith("INSERT"):
+            statements.setdefault(statement, parameters)
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+
+def _explain_sqlite(connection, statement: str, parameters) -> dict:
+    plan = [row[3] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+    indexes = sorted({match.group(1) or match.group(2) for line in plan for match in _SQLITE_INDEX.finditer(line)})
+    scans = sorted({match.group(1) for line in plan if (match := _SQLITE_SCAN.match(line.strip()))})
+    return {
+        "plan": plan,
+        "indexes": indexes,
+        "full_scans": scans,
+        "temp_sorts": sum("USE TEMP B-TREE" in line for line in plan),
+    }
+
+
+def _explain_mssql(connection, statement: str, parameters) -> dict:
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute("SET SHOWPLAN_TEXT ON")
+        cursor.execute(statement, parameters)
+        plan = []
+        while True:
+            plan += [row[0] for row in cursor.fetchall()]
+            if not cursor.nextset():
+                break
+    finally:
+        cursor.execute("SET SHOWPLAN_TEXT OFF")
+        cursor.close()
+    indexes, scans = set(), set()
+    for line in plan:
+        for operator, target in _MSSQL_OPERATOR.findall(line):
+            names = re.findall(r"\[([^\]]+)\]", target.split(" AS ")[0])
+            if operator == "Table Scan":
+                scans.add(names[-1])
+                continue
+            indexes.add(names[-1])
+            if operator == "Clustered Index Scan":
+                scans.add(names[-2])
+    return {
+        "plan": plan,
+        "indexes": sorted(indexes),
+        "full_scans": sorted(scans),
+        "temp_sorts": sum("|--Sort(" in line for line in plan),
+    }
+
+
+EXPLAINERS = {"sqlite": _explain_sqlite, "mssql": _explain_mssql}
+
+
+def _swap_indexes_to_baseline(engine) -> None:
+    with engine.begin() as connection:
+        for table, dropped, created in MIGRATION_0004:
+            for name in created:
+                connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+            for name, columns in dropped:
+                connection.exec_driver_sql(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+        connection.exec_driver_sql("ANALYZE")
+
+
+def build_cases(accounts: dict, import_spec: DatasetSpec | None = None) -> list[tuple[str, Callable]]:
+    from fastapi import UploadFile
+
+    from app.services.auth_service import AuthUser
+    from app.services.employee_import_service import import_employees_from_csv
+    from app.services.request_service import (
+        get_dashboard_summary,
+        get_inbox_counts,
+        get_inbox_page,
+        iter_request_export_rows,
+        list_requests_page,
+    )
+
+    users = {
+        "admin": AuthUser(internal_email=accounts["admin"], employee_id=employee_id(3), role_code="ADMIN"),
+        "manager": AuthUser(internal_email=accounts["manager"], employee_id=employee_id(0), role_code="DEPT_MANAGER"),
+        "printing": AuthUser(internal_email=accounts["printing"], employee_id=employee_id(2), role_code="CARD_PRINTING"),
+    }
+    recent = (date(2025, 10, 1), date(2025, 12, 31))
+    cases: list[tuple[str, Callable]] = []
+
+    for role, request_type, status_value, dates in itertools.product(
+        users, (None, "CARD"), (None, "PENDING_SECURITY_APPROVAL"), (None, recent)
+    ):
+        name = "list:" + ",".join(
+            part
+            for part in (
+                role,
+                f"type={request_type}" if request_type else "",
+                f"status={status_value}" if status_value else "",
+                "dates" if dates else "",
+            )
+            if part
+        )
+
+        def run(db, role=role, request_type=request_type, status_value=status_value, dates=dates):
+            date_from, date_to = dates or (None, None)
+            page = list_requests_page(
+                db, request_type, status_value, date_from, date_to, users[role], limit=50, include_total=True
+            )
+            if page["next_cursor"]:
+                list_requests_page(
+                    db, request_type, status_value, date_from, date_to, users[role], limit=50, cursor=page["next_cursor"]
+                )
+
+        cases.append((name, run))
+
+    for role in users:
+        cases.append((f"dashboard:{role}", lambda db, role=role: get_dashboard_summary(db, users[role])))
+        cases.append(
+            (
+                f"export:{role}",
+                lambda db, role=role: next(iter_request_export_rows(db, None, None, None, None, users[role]), None),
+            )
+        )
+
+    for role in users:
+
+        def inbox(db, role=role):
+            page = get_inbox_page(db, users[role], limit=50)
+            if page["next_cursor"]:
+                get_inbox_page(db, users[role], limit=50, cursor=page["next_cursor"])
+            get_inbox_counts(db, users[role])
+
+        cases.append((f"inbox:{role}", inbox))
+
+    if import_spec is not None:
+        # Last: the import rewrites employees.
+        body = employees_csv(import_spec)
+        cases.append(
+            ("import", lambda db: import_employees_from_csv(db, UploadFile(io.BytesIO(body), filename="employees.csv")))
+        )
+    return cases
+
+
+def capture(engine, cases: list[tuple[str, Callable]]) -> dict:
+    from app.db.database import Base, SessionLocal
+    from app.services.employee_directory import employee_directory
+
+    explain = EXPLAINERS.get(engine.dialect.name)
+    if explain is None:
+        raise SystemExit(f"no plan capture for dialect {engine.dialect.name}")
+
+    results = {}
+    for name, run in cases:
+        employee_directory.invalidate()
+        db = SessionLocal()
+        try:
+            with captured_statements(engine) as statements:
+                run(db)
+            db.rollback()
+            with engine.connect() as connection:
+                results[name] = [
+                    {"sql": " ".join(statement.split()), **explain(connection, statement, parameters)}
+                    for statement, parameters in statements.items()
+                ]
+            # Scans of subqueries are not table scans.
+            for entry in results[name]:
+                entry["full_scans"] = [table for table in entry["full_scans"] if table in Base.metadata.tables]
+        finally:
+            db.close()
+        scans = sorted({table for entry in results[name] for table in entry["full_scans"]})
+        print(f"{name}: {len(results[name])} statements, full scans: {', '.join(scans) or 'none'}", file=sys.stderr)
+    return results
+
+
+def summarize(results: dict) -> dict:
+    indexes = Counter(index for entries in results.values() for entry in entries for index in entry["indexes"])
+    scans = [
+        {"case": name, "table": table}
+        for name, entries in results.items()
+        for table in sorted({table for entry in entries for table in entry["full_scans"]})
+    ]
+    return {
+        "cases": len(results),
+        "statements": sum(len(entries) for entries in results.values()),
+        "indexes_used": dict(indexes.most_common()),
+        "full_scans": scans,
+        "request_table_scans": [scan for scan in scans if scan["table"] in REQUEST_TABLES],
+        "temp_sorts": sum(entry["temp_sorts"] for entries in results.values() for entry in entries),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = DatasetSpec()
+    parser.add_argument("--employees", type=int, default=defaults.employees)
+    parser.add_argument("--cards", type=int, default=defaults.cards)
+    parser.add_argument("--permits", type=int, default=defaults.permits)
+    parser.add_argument("--baseline", action="store_true", help="plan against the pre-0004 indexes")
+    parser.add_argument("--existing", action="store_true", help="use DATABASE_URL as is; no seeding")
+    parser.add_argument("--strict", action="store_true", help="exit 1 if a request table is fully scanned")
+    parser.add_argument("--db", help="SQLite file to (re)create; defaults to a temporary file")
+    parser.add_argument("--output", help="Write the JSON result here instead of stdout")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(employees=args.employees, cards=args.cards, permits=args.permits)
+    if not args.existing:
+        use_sqlite(args.db or os.path.join(tempfile.mkdtemp(prefix="clearancehub-plans-"), "plans.db"))
+
+    from app.db.database import engine
+
+    dataset = None
+    if not args.existing:
+        dataset = seed(spec)
+        if args.baseline:
+            _swap_indexes_to_baseline(engine)
+        else:
+            with engine.begin() as connection:
+                connection.exec_driver_sql("ANALYZE")
+    elif args.baseline:
+        raise SystemExit("--baseline needs a seeded database")
+
+    accounts = dataset.accounts if dataset else {role: f"{role}@bench.local" for role in ("admin", "manager", "printing")}
+    results = capture(engine, build_cases(accounts, spec if dataset else None))
+    summary = summarize(results)
+    output = json.dumps(
+        {
+            "benchmark": "query_plans",
+            "dialect": engine.dialect.name,
+            "baseline": args.baseline,
+            "dataset": dataset.summary() if dataset else None,
+            "summary": summary,
+            "cases": results,
+        },
+        indent=2,
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+    if args.strict and summary["request_table_scans"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Compare response_model and TypeAdapter serialization of request responses.
+
+Seeds a synthetic SQLite database, then builds request list pages of each size
+and a set of request details as an admin, and renders them two ways:
+
+- response_model: the path used before. Employees are loaded as ORM
+  instances, and FastAPI validates the payload with from_attributes, converts
+  it to JSON-compatible Python and encodes it with json.dumps.
+- adapter: the path the endpoints use now. Employee columns are selected as
+  dicts, then validated and encoded by a prebuilt TypeAdapter.
+
+Both bodies must be byte-identical. Reports items per second for each:
+
+    python -m benchmarks.serialization --page-sizes 50 500 --repeat 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.dataset import DatasetSpec, employee_id, seed, use_sqlite
+
+MODES = ("response_model", "adapter")
+
+
+def _route_field(app, path: str):
+    from fastapi.routing import APIRoute
+
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods and route.include_in_schema:
+            return route.response_field
+    raise LookupError(path)
+
+
+def _attach_orm_employees(db, items: list[dict]) -> list[dict]:
+    from app.models import Employee
+
+    employee_ids = list({item["employee_id"] for item in items})
+    employees = {row.employee_id: row for row in db.query(Employee).filter(Employee.employee_id.in_(employee_ids))}
+    return [{**item, "employee": employees.get(item["employee_id"])} for item in items]
+
+
+def _timed(render, repeat: int) -> tuple[float, bytes]:
+    body = render()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return time.perf_counter() - started, body
+
+
+def run(spec: DatasetSpec, page_sizes: list[int], details: int, repeat: int) -> dict:
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    from app.api.serialization import REQUEST_DETAIL_ADAPTER, REQUEST_LIST_ADAPTER, json_response
+    from app.db.database import SessionLocal
+    from app.main import app
+    from app.services.auth_service import AuthUser
+    from app.services.request_service import _attach_employees, get_request_detail, list_requests_page
+
+    dataset = seed(spec)
+    admin = AuthUser(internal_email=dataset.accounts["admin"], employee_id=employee_id(3), role_code="ADMIN")
+    loop = asyncio.new_event_loop()
+
+    def response_model_body(field, payload) -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=payload))
+        return JSONResponse(content).body
+
+    results = []
+    db = SessionLocal()
+    try:
+        list_field = _route_field(app, "/requests")
+        for page_size in page_sizes:
+            page = list_requests_page(db, user=admin, limit=page_size)
+            items = [{key: value for key, value in item.items() if key != "employee"} for item in page["items"]]
+
+            def legacy() -> bytes:
+                db.expunge_all()
+                payload = {**page, "items": _attach_orm_employees(db, items)}
+                return response_model_body(list_field, payload)
+
+            def adapter() -> bytes:
+                payload = {**page, "items": _attach_employees(db, [dict(item) for item in items])}
+                return json_response(REQUEST_LIST_ADAPTER, payload).body
+
+            results.append(_compare(f"list:{page_size}", len(items), repeat, legacy, adapter))
+
+        detail_field = _route_field(app, "/requests/{request_id}")
+        request_ids = [item["id"] for item in list_requests_page(db, request_type="ACCESS", user=admin, limit=details)["items"]]
+        payloads = [get_request_detail(db, request_id, "ACCESS", admin) for request_id in request_ids]
+        results.append(
+            _compare(
+                f"detail:{len(payloads)}",
+                len(payloads),
+                repeat,
+                lambda: b"".join(response_model_body(detail_field, payload) for payload in payloads),
+                lambda: b"".join(json_response(REQUEST_DETAIL_ADAPTER, payload).body for payload in payloads),
+            )
+        )
+    finally:
+        db.close()
+        loop.close()
+    return {"dataset": dataset.summary(), "repeat": repeat, "results": results}
+
+
+def _compare(name: str, items: int, repeat: int, legacy, adapter) -> dict:
+    timings = {}
+    bodies = {}
+    for mode, render in zip(MODES, (legacy, adapter)):
+        elapsed, bodies[mode] = _timed(render, repeat)
+        timings[mode] = {
+            "ms_per_response": round(elapsed * 1000 / repeat, 3),
+            "items_per_second": round(items * repeat / elapsed),
+        }
+    if bodies["response_model"] != bodies["adapter"]:
+        raise SystemExit(f"{name}: response bodies differ")
+    return {
+        "case": name,
+        "items": items,
+        "bytes": len(bodies["adapter"]),
+        **timings,
+        "speedup": round(timings["response_model"]["ms_per_response"] / timings["adapter"]["ms_per_response"], 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = DatasetSpec()
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--details", type=int, default=50, help="request details rendered per repetition")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--employees", type=int, default=defaults.employees)
+    parser.add_argument("--cards", type=int, default=defaults.cards)
+    parser.add_argument("--permits", type=int, default=defaults.permits)
+    parser.add_argument("--db", help="SQLite file to (re)create; defaults to a temporary file")
+    args = parser.parse_args()
+
+    use_sqlite(args.db or os.path.join(tempfile.mkdtemp(prefix="clearancehub-serialization-"), "serialization.db"))
+    spec = DatasetSpec(employees=args.employees, cards=args.cards, permits=args.permits)
+    print(json.dumps({"benchmark": "serialization", **run(spec, args.page_sizes, args.details, args.repeat)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
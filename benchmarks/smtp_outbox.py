@@ -0,0 +1,175 @@
+"""Check that the SMTP outbox delivers every message over reused connections.
+
+Starts a stub SMTP server on a local port, points the outbox at it and queues a
+burst of messages, waits longer than the idle timeout and queues a second
+burst. Every message must reach the stub exactly once, with no more connections
+than workers per burst. With --drop-every N the stub hangs up when a connection
+starts its (N+1)th message, so the retry and reconnect path has to recover it.
+The script exits non-zero on any failure:
+
+    python -m benchmarks.smtp_outbox --messages 200 --workers 2 --drop-every 50
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import Counter
+
+
+class _StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, drop_every: int):
+        super().__init__(("127.0.0.1", 0), _StubSMTPHandler)
+        self.drop_every = drop_every
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.dropped = 0
+        self.recipients: Counter = Counter()
+
+
+class _StubSMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        messages = 0
+        recipients: list[str] = []
+        self._reply("220 stub ESMTP")
+        while line := self.rfile.readline():
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb == "EHLO":
+                self._reply("250-stub")
+                self._reply("250 8BITMIME")
+            elif verb == "MAIL":
+                if server.drop_every and messages >= server.drop_every:
+                    with server.lock:
+                        server.dropped += 1
+                    return
+                recipients = []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command.split(":", 1)[1].strip().strip("<>"))
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                messages += 1
+                with server.lock:
+                    server.recipients.update(recipients)
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("250 OK")
+
+
+def _wait_for(outbox, expected: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = outbox.stats()
+        if stats["sent"] + stats["failed"] >= expected:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def run(messages: int, workers: int, drop_every: int, idle_timeout: int) -> dict:
+    stub = _StubSMTPServer(drop_every)
+    threading.Thread(target=stub.serve_forever, name="stub-smtp", daemon=True).start()
+    os.environ.update(
+        {
+            "SMTP_ENABLED": "true",
+            "SMTP_HOST": "127.0.0.1",
+            "SMTP_PORT": str(stub.server_address[1]),
+            "SMTP_USER": "",
+            "SMTP_USE_TLS": "false",
+            "SMTP_USE_SSL": "false",
+            "SMTP_OUTBOX_WORKERS": str(workers),
+            "SMTP_OUTBOX_MAX_QUEUE": str(messages),
+            "SMTP_RETRY_BACKOFF_SECONDS": "0.01",
+            "SMTP_IDLE_TIMEOUT_SECONDS": str(idle_timeout),
+        }
+    )
+
+    from app.utils.email import outbox
+
+    failures = []
+    expected: Counter = Counter()
+    bursts = []
+    try:
+        for burst in range(2):
+            connections = stub.connections
+            started = time.perf_counter()
+            for index in range(messages):
+                to_email = f"user{burst}-{index}@bench.local"
+                expected[to_email] += 1
+                if not outbox.enqueue(to_email, "OTP", f"Your code is {index:06d}"):
+                    failures.append(f"burst {burst}: message {index} was not queued")
+            if not _wait_for(outbox, sum(expected.values()), timeout=30 + messages * 0.05):
+                failures.append(f"burst {burst}: timed out waiting for delivery")
+            seconds = time.perf_counter() - started
+            bursts.append(
+                {
+                    "messages": messages,
+                    "connections": stub.connections - connections,
+                    "seconds": round(seconds, 3),
+                    "messages_per_second": round(messages / seconds, 1),
+                }
+            )
+            # Let the workers close their idle connections before the next burst.
+            time.sleep(idle_timeout * 2)
+    finally:
+        outbox.stop()
+        stub.shutdown()
+        stub.server_close()
+
+    stats = outbox.stats()
+    if stub.recipients != expected:
+        missing = sum((expected - stub.recipients).values())
+        duplicated = sum((stub.recipients - expected).values())
+        failures.append(f"{missing} messages missing and {duplicated} duplicated at the stub")
+    if stats["failed"]:
+        failures.append(f"outbox gave up on {stats['failed']} messages")
+    # A dropped connection costs one extra connection on reconnect.
+    allowed = workers + stub.dropped
+    for index, burst in enumerate(bursts):
+        if burst["connections"] > allowed:
+            failures.append(f"burst {index}: {burst['connections']} connections for {workers} workers")
+
+    return {
+        "workers": workers,
+        "drop_every": drop_every,
+        "bursts": bursts,
+        "dropped_connections": stub.dropped,
+        "outbox": stats,
+        "failures": failures,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200, help="messages per burst")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--drop-every", type=int, default=0, help="hang up after this many messages per connection")
+    parser.add_argument("--idle-timeout", type=int, default=1, help="SMTP_IDLE_TIMEOUT_SECONDS for the run")
+    args = parser.parse_args()
+
+    result = run(args.messages, args.workers, args.drop_every, args.idle_timeout)
+    print(json.dumps({"benchmark": "smtp_outbox", **result}, indent=2))
+    if result["failures"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()